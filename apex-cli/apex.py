@@ -9,8 +9,11 @@ import sys
 import json
 import logging
 import textwrap
+import socket
+import threading
 from apex_mind_core.core.orchestrator import Orchestrator
 from apex_mind_core.core.wasi_bridge import WASIGuard, HardwareOp, HardwareOpType
+from apex_mind_core.core import mission_queue
 import sys
 
 sys.path.append("C:/Users/danil/Desktop/apex-mind-core_v0.1")
@@ -68,6 +71,9 @@ def show_quick_help():
     Основные команды:
       execute    Выполнение пользовательских задач
       validate   Проверка безопасности операций
+      submit     Поставить задачу в очередь миссий
+      worker     Обрабатывать задачи из очереди
+      result     Статус и результат задачи из очереди
       config     Управление конфигурацией системы
       manifest   Работа с файлами разрешений
       system     Системные операции
@@ -241,6 +247,142 @@ def validate(
         typer.echo(f"❌ Ошибка валидации: {e}", err=True)
         raise typer.Exit(code=3)
 
+# Команды очереди миссий
+@app.command()
+def submit(
+    ctx: typer.Context,
+    task: Optional[str] = typer.Argument(None, help="Текст задачи"),
+    input: Optional[str] = typer.Option(None, "--input", help="Файл с задачами, по одной на строку"),
+    queue: Optional[str] = typer.Option(None, "--queue", help="URL очереди (по умолчанию APEX_QUEUE_URL)"),
+    wait: bool = typer.Option(False, "--wait", help="Дождаться результата"),
+    timeout: Optional[float] = typer.Option(None, "--timeout", help="Время ожидания результата, с"),
+):
+    """
+    Поставить задачу в очередь миссий
+
+    Примеры:
+      apex submit "Найти информацию о Python"
+      apex submit --input tasks.txt --queue sqlite:///shared/queue.db
+      apex submit "Найти информацию о Python" --wait --timeout 120
+    """
+    if input:
+        try:
+            with open(input, 'r', encoding='utf-8') as f:
+                tasks = [line.strip() for line in f if line.strip()]
+        except Exception as e:
+            typer.echo(f"Ошибка чтения файла: {e}", err=True)
+            raise typer.Exit(code=1)
+    elif task:
+        tasks = [task]
+    else:
+        typer.echo("Не указана задача!", err=True)
+        raise typer.Exit(code=1)
+
+    if ctx.obj.dry_run:
+        typer.echo(f"[DRY-RUN] В очередь: {len(tasks)} задач(и)")
+        return
+
+    try:
+        backend = mission_queue.open_queue(queue)
+        mission_ids = [backend.enqueue(t) for t in tasks]
+        for mission_id in mission_ids:
+            typer.echo(mission_id)
+        if wait:
+            for mission_id in mission_ids:
+                record = mission_queue.wait_for_result(backend, mission_id, timeout)
+                typer.echo(record["result"] if record["status"] == mission_queue.STATUS_DONE
+                           else f"❌ [FAILED] {mission_id}: {record['error']}")
+    except TimeoutError as e:
+        typer.echo(f"❌ [TIMEOUT] {e}", err=True)
+        raise typer.Exit(code=2)
+    except Exception as e:
+        logging.error(f"Ошибка постановки в очередь: {e}")
+        typer.echo(f"❌ [ERROR] {e}", err=True)
+        raise typer.Exit(code=8)
+
+@app.command()
+def worker(
+    ctx: typer.Context,
+    queue: Optional[str] = typer.Option(None, "--queue", help="URL очереди (по умолчанию APEX_QUEUE_URL)"),
+    concurrency: int = typer.Option(1, "--concurrency", help="Число параллельных обработчиков"),
+    max_missions: Optional[int] = typer.Option(None, "--max-missions", help="Завершиться после N задач на обработчик"),
+    visibility_timeout: float = typer.Option(
+        mission_queue.DEFAULT_VISIBILITY_TIMEOUT, "--visibility-timeout",
+        help="Через сколько секунд задача упавшего обработчика вернётся в очередь"
+    ),
+    prewarm: bool = typer.Option(True, "--prewarm/--no-prewarm", help="Заранее открыть соединения к источникам поиска"),
+):
+    """
+    Обрабатывать задачи из очереди миссий
+
+    Примеры:
+      apex worker
+      apex worker --queue sqlite:///shared/queue.db --concurrency 4
+    """
+    try:
+        backend = mission_queue.open_queue(queue)
+    except Exception as e:
+        typer.echo(f"❌ [ERROR] {e}", err=True)
+        raise typer.Exit(code=8)
+
+    if prewarm:
+        warmed = orchestrator.prewarm_connections()
+        ok = sum(1 for r in warmed.values() if not isinstance(r, Exception))
+        typer.echo(f"Соединений открыто заранее: {ok}/{len(warmed)}")
+
+    workers = [
+        mission_queue.MissionWorker(
+            backend, orchestrator, visibility_timeout=visibility_timeout,
+            worker_id=f"{socket.gethostname()}:{os.getpid()}:{i}"
+        )
+        for i in range(max(1, concurrency))
+    ]
+    threads = [
+        threading.Thread(target=w.run, args=(max_missions,), daemon=True)
+        for w in workers
+    ]
+    typer.echo(f"✅ Обработчиков запущено: {len(threads)}")
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            while t.is_alive():
+                t.join(timeout=1)
+    except KeyboardInterrupt:
+        for w in workers:
+            w.stop()
+        for t in threads:
+            t.join()
+    typer.echo(f"Обработано задач: {sum(w.processed for w in workers)}")
+
+@app.command()
+def result(
+    ctx: typer.Context,
+    mission_id: Optional[str] = typer.Argument(None, help="Идентификатор задачи"),
+    queue: Optional[str] = typer.Option(None, "--queue", help="URL очереди (по умолчанию APEX_QUEUE_URL)"),
+):
+    """
+    Статус и результат задачи из очереди (без идентификатора — сводка очереди)
+
+    Примеры:
+      apex result 3f2a9c...
+      apex result
+    """
+    try:
+        backend = mission_queue.open_queue(queue)
+        if mission_id is None:
+            for status, count in backend.stats().items():
+                typer.echo(f"{status}: {count}")
+            return
+        record = backend.status(mission_id)
+    except Exception as e:
+        typer.echo(f"❌ [ERROR] {e}", err=True)
+        raise typer.Exit(code=8)
+    if record is None:
+        typer.echo(f"❌ Задача не найдена: {mission_id}", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(json.dumps(record, ensure_ascii=False, indent=2, default=str))
+
 # Группа команд config
 config_app = typer.Typer()
 app.add_typer(config_app, name="config", help="Управление конфигурацией")
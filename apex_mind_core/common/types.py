@@ -7,3 +7,5 @@ class HardwareOpType(Enum):
     SensorRead = 3
     NetworkRequest = 4
     CameraCapture = 5
+    # Только на стороне Python: обход каталога с фильтром glob
+    DirectoryScan = 6
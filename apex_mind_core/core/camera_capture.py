@@ -0,0 +1,152 @@
+import logging
+import queue
+import threading
+import time
+
+
+class Frame:
+    """Кадр в буфере пула; после обработки обязательно вызвать release()"""
+    __slots__ = ("pool", "index", "view", "number", "timestamp", "in_use")
+
+    def __init__(self, pool: "FrameBufferPool", index: int, view: memoryview):
+        self.pool = pool
+        self.index = index
+        self.view = view
+        self.number = -1
+        self.timestamp = 0.0
+        # Кадр выдан acquire() и ещё не возвращён в пул
+        self.in_use = False
+
+    def release(self):
+        self.pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class FrameBufferPool:
+    """Пул заранее выделенных буферов кадров, выдаваемых как memoryview"""
+    def __init__(self, frame_size: int, count: int = 8):
+        if frame_size <= 0 or count <= 0:
+            raise ValueError("Frame size and buffer count must be positive")
+        self.frame_size = frame_size
+        self._buffers = [bytearray(frame_size) for _ in range(count)]
+        self._frames = [Frame(self, i, memoryview(buf)) for i, buf in enumerate(self._buffers)]
+        self._free = queue.LifoQueue()
+        for frame in self._frames:
+            self._free.put(frame)
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> int:
+        return self._free.qsize()
+
+    def acquire(self, timeout: float = None) -> Frame:
+        """Берёт свободный буфер; None, если за timeout он не освободился"""
+        try:
+            frame = self._free.get(timeout=timeout) if timeout != 0 else self._free.get_nowait()
+        except queue.Empty:
+            return None
+        frame.in_use = True
+        return frame
+
+    def release(self, frame: Frame):
+        """Возвращает кадр в пул; повторный release() того же кадра ничего не делает"""
+        if frame.pool is not self:
+            raise ValueError("Frame belongs to another pool")
+        with self._lock:
+            if not frame.in_use:
+                return
+            frame.in_use = False
+        self._free.put(frame)
+
+
+class SimulatedFrameSource:
+    """
+    Локальный источник кадров для тестов без камеры.
+    Градиент строится один раз; кадр — это сдвинутое окно шаблона,
+    копируемое в буфер без создания новых объектов bytes.
+    """
+    def __init__(self, width: int = 640, height: int = 480, channels: int = 3):
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.frame_size = width * height * channels
+        pattern = bytes(range(256)) * (self.frame_size // 256 + 2)
+        self._pattern = memoryview(pattern)
+
+    def fill(self, view: memoryview, number: int):
+        offset = number % 256
+        view[:self.frame_size] = self._pattern[offset:offset + self.frame_size]
+
+
+class CameraStream:
+    """
+    Непрерывный захват кадров в пул буферов.
+    Если потребитель не успевает и свободных буферов нет, кадр пропускается
+    (счётчик dropped), а не выделяется новый буфер.
+    """
+    def __init__(self, source, fps: float = 30.0, buffers: int = 8):
+        self.source = source
+        self.fps = fps
+        self.pool = FrameBufferPool(source.frame_size, buffers)
+        self._ready = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self.captured = 0
+        self.dropped = 0
+        self.logger = logging.getLogger("CameraStream")
+
+    def capture(self, timeout: float = None) -> Frame:
+        """Захват одного кадра в буфер пула"""
+        frame = self.pool.acquire(timeout)
+        if frame is None:
+            return None
+        self.source.fill(frame.view, self.captured)
+        frame.number = self.captured
+        frame.timestamp = time.time()
+        self.captured += 1
+        return frame
+
+    def start(self) -> "CameraStream":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="camera-capture", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self):
+        period = 1.0 / self.fps if self.fps > 0 else 0.0
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            frame = self.capture(timeout=0)
+            if frame is None:
+                self.dropped += 1
+            else:
+                self._ready.put(frame)
+            next_at += period
+            self._stop.wait(max(0.0, next_at - time.monotonic()))
+
+    def frames(self, timeout: float = 1.0):
+        """Итератор готовых кадров; каждый кадр нужно вернуть в пул через release()"""
+        while not self._stop.is_set() or not self._ready.empty():
+            try:
+                yield self._ready.get(timeout=timeout)
+            except queue.Empty:
+                if self._thread is None:
+                    return
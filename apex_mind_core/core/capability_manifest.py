@@ -1,7 +1,10 @@
-import json
 import os
 
+from . import json_codec
+
 class CapabilityManifest:
+    DEFAULT_MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+
     def __init__(self, manifest_dict):
         self.skill_name = manifest_dict.get("skill_name", "default")
         self.filesystem = manifest_dict.get("filesystem", {"read": [], "write": [], "delete": []})
@@ -9,10 +12,25 @@ class CapabilityManifest:
         self.gpu = manifest_dict.get("gpu", False)
         self.sensors = manifest_dict.get("sensors", False)  # Добавить
         self.camera = manifest_dict.get("camera", False)    # Добавить
+        # Лимиты запросов по доменам: {"домен": {"rate": в секунду, "burst": N}}
+        self.rate_limits = manifest_dict.get("rate_limits", {})
+        # Максимальный размер тела HTTP-ответа в байтах
+        self.max_response_bytes = manifest_dict.get("max_response_bytes", self.DEFAULT_MAX_RESPONSE_BYTES)
+        # Кэширование GET-ответов с условными запросами (ETag/Last-Modified)
+        self.http_cache = manifest_dict.get("http_cache", True)
+        # Кэш DNS-разрешения с учётом TTL для HTTP-запросов
+        self.dns_cache = manifest_dict.get("dns_cache", True)
+        # Класс допустимых символов для фильтрации прочитанных файлов (None — по умолчанию)
+        self.content_filter = manifest_dict.get("content_filter")
+        # fsync для записей на диск (для буферизованных дозаписей — один раз на сброс)
+        self.fsync = manifest_dict.get("fsync", False)
+        # Кэш повторных чтений файлов (opt-in) и его бюджет в байтах
+        self.read_cache = manifest_dict.get("read_cache", False)
+        self.read_cache_bytes = manifest_dict.get("read_cache_bytes")
 
     @classmethod
     def loads(cls, s):
-        return cls(json.loads(s))
+        return cls(json_codec.loads(s))
     
     def validate(self, operation: str, path: str) -> bool:
         """Проверяет разрешен ли доступ к пути"""
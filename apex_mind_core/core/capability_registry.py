@@ -1,29 +1,115 @@
+import fnmatch
+import json
+import re
+
+
+class _CompiledCapability:
+    """Предварительно скомпилированные правила доступа одной возможности"""
+    __slots__ = ("bit", "has_paths", "exact", "prefixes", "pattern")
+
+    def __init__(self, bit: int, spec: dict):
+        self.bit = bit
+        paths = spec.get("paths", [])
+        self.has_paths = "paths" in spec
+        exact = set()
+        prefixes = []
+        globs = []
+        for allowed in paths:
+            body = allowed[:-1] if allowed.endswith("*") else allowed
+            if any(ch in body for ch in "*?["):
+                # Шаблон со спецсимволами внутри пути — компилируем как glob
+                globs.append(fnmatch.translate(allowed))
+                globs.append(fnmatch.translate(allowed.lstrip("/")))
+            elif allowed.endswith("*"):
+                # разрешаем и "/workspace/read/" и "workspace/read/"
+                prefixes.append(body)
+                prefixes.append(body.lstrip("/"))
+            else:
+                # точное совпадение с учетом возможного отсутствия ведущего '/'
+                exact.add(allowed)
+                if allowed.startswith("/"):
+                    exact.add(allowed.lstrip("/"))
+        self.exact = frozenset(exact)
+        self.prefixes = tuple(prefixes)
+        self.pattern = re.compile("|".join(globs)) if globs else None
+
+    def allows(self, path: str) -> bool:
+        if path in self.exact:
+            return True
+        if self.prefixes and path.startswith(self.prefixes):
+            return True
+        return bool(self.pattern and self.pattern.match(path))
+
+
 class CapabilityRegistry:
-    def __init__(self):
-        self.capabilities = {
-            "WebSearch": {"network": True, "risk_level": 1, "paths": []},
-            "FileRead": {"filesystem": True, "risk_level": 2, "paths": ["/workspace/read/*"]}
-        }
-    
+    DEFAULT_CAPABILITIES = {
+        "WebSearch": {"network": True, "risk_level": 1, "paths": []},
+        "FileRead": {"filesystem": True, "risk_level": 2, "paths": ["/workspace/read/*"]}
+    }
+
+    def __init__(self, capabilities: dict = None):
+        self.capabilities = {}
+        self._index = {}
+        self._granted_mask = 0
+        self._next_bit = 1
+        self._mask_cache = {}
+        for name, spec in (capabilities if capabilities is not None else self.DEFAULT_CAPABILITIES).items():
+            self.register(name, spec)
+
+    @classmethod
+    def from_file(cls, path: str) -> "CapabilityRegistry":
+        """Загружает каталог возможностей из JSON-файла вида {"имя": {...}}"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def register(self, name: str, spec: dict):
+        """Регистрирует возможность и сразу компилирует её в индекс"""
+        compiled = self._index.get(name)
+        bit = compiled.bit if compiled else self._next_bit
+        if not compiled:
+            self._next_bit <<= 1
+            self._mask_cache.clear()
+        self.capabilities[name] = spec
+        self._index[name] = _CompiledCapability(bit, spec)
+        self._granted_mask |= bit
+
+    def unregister(self, name: str):
+        compiled = self._index.pop(name, None)
+        self.capabilities.pop(name, None)
+        if compiled:
+            self._granted_mask &= ~compiled.bit
+            # Маска навыка с этой возможностью больше не может быть удовлетворена
+            self._mask_cache.clear()
+
+    def mask_for(self, capabilities) -> int:
+        """Битовая маска для набора возможностей (-1, если какая-то неизвестна)"""
+        key = tuple(capabilities)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = 0
+            for name in key:
+                compiled = self._index.get(name)
+                if compiled is None:
+                    mask = -1
+                    break
+                mask |= compiled.bit
+            self._mask_cache[key] = mask
+        return mask
+
+    def authorize(self, capabilities) -> bool:
+        """Проверяет, что все требуемые возможности зарегистрированы, одной операцией над маской"""
+        mask = self.mask_for(capabilities)
+        return mask >= 0 and (mask & self._granted_mask) == mask
+
     def check_capability(self, skill_name: str, path: str = "") -> bool:
-        if skill_name not in self.capabilities:
+        compiled = self._index.get(skill_name)
+        if compiled is None:
             return False
-            
-        caps = self.capabilities[skill_name]
-        if "paths" in caps and path:
+
+        if compiled.has_paths and path:
             # Поддерживаем wildcard '*' и относительные пути
-            for allowed in caps["paths"]:
-                if allowed.endswith("*"):
-                    prefix = allowed[:-1]
-                    # разрешаем и "/workspace/read/" и "workspace/read/"
-                    if path.startswith(prefix) or path.startswith(prefix.lstrip("/")):
-                        return True
-                else:
-                    # точное совпадение с учетом возможного отсутствия ведущего '/'
-                    if path == allowed or (allowed.startswith("/") and path == allowed.lstrip("/")):
-                        return True
-            return False
-            
+            return compiled.allows(path)
+
         return True
 
 # WASI-compatible permission check
@@ -0,0 +1,49 @@
+import codecs
+import re
+from functools import lru_cache
+
+# По умолчанию оставляем кириллицу, цифры и пробельные символы
+DEFAULT_ALLOWLIST = r"ЁёА-Яа-я0-9\s"
+
+
+class CharClassFilter:
+    """
+    Фильтр содержимого по классу допустимых символов.
+    Регулярное выражение компилируется один раз; для ASCII-текста
+    используется str.translate по заранее построенной таблице.
+    """
+    def __init__(self, allowlist: str = DEFAULT_ALLOWLIST):
+        self.allowlist = allowlist
+        self._reject = re.compile(f"[^{allowlist}]+")
+        allowed = re.compile(f"[{allowlist}]")
+        self._ascii_table = {
+            code: None for code in range(128) if not allowed.match(chr(code))
+        }
+
+    def filter(self, text: str) -> str:
+        if text.isascii():
+            return text.translate(self._ascii_table)
+        return self._reject.sub("", text)
+
+    def iter_filter(self, chunks, encoding: str = "utf-8"):
+        """
+        Инкрементальная фильтрация потока байтовых чанков.
+        Многобайтовые символы на границе чанков корректно склеиваются декодером.
+        """
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield self.filter(text)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield self.filter(tail)
+
+    def filter_stream(self, chunks, encoding: str = "utf-8") -> str:
+        return "".join(self.iter_filter(chunks, encoding)).strip()
+
+
+@lru_cache(maxsize=32)
+def get_filter(allowlist: str = None) -> CharClassFilter:
+    """Возвращает скомпилированный фильтр для allowlist (кэшируется)"""
+    return CharClassFilter(allowlist or DEFAULT_ALLOWLIST)
@@ -0,0 +1,90 @@
+"""
+CPU-бэкенд для операций GpuCompute.
+
+Используется, когда GPU-адаптер недоступен. WGSL-шейдер на CPU не исполняется;
+вместо этого операция описывает ядро из поддерживаемого набора:
+
+    op.kernel = {"name": "mul", "dtype": "float32", "value": 2.0}
+
+Элементные: add, sub, mul, div, neg, abs, sqrt, square, exp, log, relu, clip
+Редукции:   sum, min, max, mean
+Буферные:   copy, reverse, sort, cumsum, byteswap, cast (параметр "to")
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy — необязательная зависимость
+    np = None
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _scalar(kernel: dict):
+    if "value" not in kernel:
+        raise ValueError(f"Kernel '{kernel['name']}' requires a 'value' argument")
+    return kernel["value"]
+
+
+_MAP_KERNELS = {
+    "add": lambda a, k: a + _scalar(k),
+    "sub": lambda a, k: a - _scalar(k),
+    "mul": lambda a, k: a * _scalar(k),
+    "div": lambda a, k: a / _scalar(k),
+    "neg": lambda a, k: np.negative(a),
+    "abs": lambda a, k: np.abs(a),
+    "sqrt": lambda a, k: np.sqrt(a),
+    "square": lambda a, k: np.square(a),
+    "exp": lambda a, k: np.exp(a),
+    "log": lambda a, k: np.log(a),
+    "relu": lambda a, k: np.maximum(a, 0),
+    "clip": lambda a, k: np.clip(a, k.get("min"), k.get("max")),
+}
+
+_REDUCE_KERNELS = {
+    "sum": np.sum if np is not None else None,
+    "min": np.min if np is not None else None,
+    "max": np.max if np is not None else None,
+    "mean": np.mean if np is not None else None,
+}
+
+_BUFFER_KERNELS = {
+    "copy": lambda a, k: a.copy(),
+    "reverse": lambda a, k: a[::-1],
+    "sort": lambda a, k: np.sort(a),
+    "cumsum": lambda a, k: np.cumsum(a, dtype=a.dtype),
+    "byteswap": lambda a, k: a.byteswap(),
+    "cast": lambda a, k: a.astype(k["to"]),
+}
+
+SUPPORTED_KERNELS = frozenset(_MAP_KERNELS) | frozenset(_REDUCE_KERNELS) | frozenset(_BUFFER_KERNELS)
+
+
+def run_kernel(kernel, data: bytes) -> bytes:
+    """Выполняет ядро над входным буфером и возвращает байты результата"""
+    if np is None:
+        raise ImportError("NumPy is required for the CPU compute backend")
+    if isinstance(kernel, str):
+        kernel = {"name": kernel}
+
+    name = kernel.get("name")
+    dtype = np.dtype(kernel.get("dtype", "float32"))
+    if len(data) % dtype.itemsize:
+        raise ValueError(
+            f"Buffer of {len(data)} bytes is not a multiple of {dtype} item size"
+        )
+    # Представление без копирования входных байт
+    values = np.frombuffer(data, dtype=dtype)
+
+    if name in _MAP_KERNELS:
+        result = _MAP_KERNELS[name](values, kernel)
+        # Элементные ядра сохраняют тип буфера, как и шейдер с тем же layout
+        result = np.asarray(result).astype(dtype, copy=False)
+    elif name in _REDUCE_KERNELS:
+        result = np.asarray([_REDUCE_KERNELS[name](values)], dtype=dtype)
+    elif name in _BUFFER_KERNELS:
+        result = _BUFFER_KERNELS[name](values, kernel)
+    else:
+        raise ValueError(f"Unsupported CPU kernel: {name}")
+
+    return np.ascontiguousarray(result).tobytes()
@@ -0,0 +1,102 @@
+"""
+Дедлайн и отмена миссии.
+
+Orchestrator.executor устанавливает дедлайн миссии в контекст выполнения
+(contextvars), а HTTP-запросы, операции ReptilianEngine, навыки и перебор
+источников поиска сверяются с ним: тайм-аут каждого вызова урезается
+до остатка бюджета, а работа, которая уже не успеет, не начинается.
+
+    with use_deadline(Deadline(30)):
+        orchestrator.executor({"mission": "..."})
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DeadlineExceeded(TimeoutError):
+    """Бюджет времени миссии исчерпан или миссия отменена"""
+
+
+class Deadline:
+    """
+    Абсолютный срок (по time.monotonic) с токеном отмены.
+    Deadline(None) не ограничивает время, но поддерживает cancel().
+    """
+    __slots__ = ("expires_at", "_cancelled")
+
+    def __init__(self, timeout: float = None):
+        self.expires_at = None if timeout is None else time.monotonic() + timeout
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> float:
+        """Оставшееся время в секундах; None — без ограничения"""
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def check(self, what: str = "operation"):
+        if self._cancelled.is_set():
+            raise DeadlineExceeded(f"Mission cancelled before {what}")
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            raise DeadlineExceeded(f"Mission deadline exceeded before {what}")
+
+    def timeout(self, default: float = None, what: str = "operation") -> float:
+        """Тайм-аут вызова: default, урезанный до остатка бюджета"""
+        self.check(what)
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return remaining if default is None else min(default, remaining)
+
+    def wait(self, seconds: float) -> bool:
+        """Пауза, прерываемая отменой; False, если пауза не уложилась в бюджет"""
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            self._cancelled.wait(remaining)
+            return False
+        return not self._cancelled.wait(seconds)
+
+
+_current = contextvars.ContextVar("apex_deadline", default=None)
+
+
+def current_deadline() -> Deadline:
+    return _current.get()
+
+
+@contextmanager
+def use_deadline(deadline: Deadline):
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check_deadline(what: str = "operation"):
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(what)
+
+
+def call_timeout(default: float = None, what: str = "operation") -> float:
+    """Тайм-аут для блокирующего вызова с учётом текущего дедлайна"""
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    return deadline.timeout(default, what)
@@ -0,0 +1,162 @@
+"""
+Кэш DNS-разрешения для HTTP-слоя.
+
+install() подменяет create_connection в urllib3 (через него соединяется
+requests): имя хоста разрешается через кэш, соединение открывается по
+IP-адресу, а SNI и проверка сертификата по-прежнему используют имя хоста.
+Адреса всегда даёт системный резолвер (getaddrinfo учитывает /etc/hosts
+и split-horizon); dnspython, если установлен, нужен только чтобы узнать
+TTL, иначе используется DEFAULT_TTL.
+
+Подмена действует на весь процесс, но кэш можно выключить для отдельного
+вызова через enabled(False) — так HTTPExecutor соблюдает "dns_cache": false
+в манифесте, даже если кэш уже подключил другой манифест или prewarm().
+"""
+import contextvars
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import dns.exception
+    import dns.resolver
+except ImportError:  # dnspython — необязательная зависимость
+    dns = None
+
+logger = logging.getLogger("DNSCache")
+
+
+class _Entry:
+    __slots__ = ("addresses", "expires_at")
+
+    def __init__(self, addresses: list, expires_at: float):
+        self.addresses = addresses
+        self.expires_at = expires_at
+
+
+class DNSCache:
+    DEFAULT_TTL = 60.0
+    MIN_TTL = 5.0
+    MAX_TTL = 3600.0
+    # Сколько ещё можно отдавать устаревшую запись, если резолвер недоступен
+    STALE_GRACE = 300.0
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Отдельная блокировка на хост: параллельные промахи не дублируют запросы
+        self._resolving = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, host: str) -> tuple:
+        """Возвращает (адреса, ttl)"""
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return addresses, self._ttl(host)
+
+    def _ttl(self, host: str) -> float:
+        if dns is None:
+            return self.DEFAULT_TTL
+        ttls = []
+        for rdtype in ("A", "AAAA"):
+            try:
+                ttls.append(dns.resolver.resolve(host, rdtype).rrset.ttl)
+            except dns.exception.DNSException:
+                # Нет записей этого типа, имя только в /etc/hosts
+                # или DNS недоступен напрямую
+                continue
+        return min(ttls) if ttls else self.DEFAULT_TTL
+
+    def resolve(self, host: str) -> list:
+        """Список IP-адресов хоста с учётом TTL"""
+        now = time.monotonic()
+        entry = self._entries.get(host)
+        if entry is not None and entry.expires_at > now:
+            self.hits += 1
+            return entry.addresses
+
+        with self._lock:
+            host_lock = self._resolving.setdefault(host, threading.Lock())
+        with host_lock:
+            entry = self._entries.get(host)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.addresses
+            self.misses += 1
+            try:
+                addresses, ttl = self._lookup(host)
+            except Exception as e:
+                if entry is not None and entry.expires_at + self.STALE_GRACE > time.monotonic():
+                    logger.warning(f"DNS lookup for {host} failed ({e}), using stale addresses")
+                    return entry.addresses
+                raise
+            ttl = min(max(ttl, self.MIN_TTL), self.MAX_TTL)
+            self._entries[host] = _Entry(addresses, time.monotonic() + ttl)
+            logger.debug(f"Resolved {host} -> {addresses} (ttl {ttl:.0f}s)")
+            return addresses
+
+    def invalidate(self, host: str):
+        self._entries.pop(host, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+dns_cache = DNSCache()
+
+_original_create_connection = None
+_install_lock = threading.Lock()
+# Включён ли кэш для текущего вызова (по умолчанию — везде после install())
+_enabled = contextvars.ContextVar("dns_cache_enabled", default=True)
+
+
+@contextmanager
+def enabled(flag: bool = True):
+    """Включает или выключает кэш для соединений внутри блока"""
+    token = _enabled.set(flag)
+    try:
+        yield
+    finally:
+        _enabled.reset(token)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+def _create_connection(address, *args, **kwargs):
+    host, port = address
+    if not _enabled.get() or _is_ip(host) or host == "localhost":
+        return _original_create_connection(address, *args, **kwargs)
+
+    error = None
+    for ip in dns_cache.resolve(host):
+        try:
+            return _original_create_connection((ip, port), *args, **kwargs)
+        except OSError as e:
+            error = e
+    # Ни один адрес не ответил — при следующей попытке разрешаем заново
+    dns_cache.invalidate(host)
+    if error is None:
+        raise OSError(f"No addresses for {host}")
+    raise error
+
+
+def install():
+    """Подключает кэш к urllib3 (идемпотентно)"""
+    global _original_create_connection
+    from urllib3.util import connection
+
+    with _install_lock:
+        if _original_create_connection is not None:
+            return
+        _original_create_connection = connection.create_connection
+        connection.create_connection = _create_connection
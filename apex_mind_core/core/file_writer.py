@@ -0,0 +1,126 @@
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import weakref
+
+logger = logging.getLogger("FileWriter")
+
+def ensure_parent_dir(path: str):
+    # Без кэша созданных каталогов: в резидентном процессе каталог могут удалить
+    directory = os.path.dirname(path)
+    if not directory:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        raise PermissionError(f"Cannot create directory for {path}: {e}")
+
+
+def atomic_write(path: str, data: bytes, fsync: bool = False) -> int:
+    """Запись через временный файл в том же каталоге и os.replace"""
+    ensure_parent_dir(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            written = f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+class WriteCoalescer:
+    """
+    Склеивает множество мелких дозаписей в один файл.
+    Данные копятся в памяти и сбрасываются одним open/write (и одним fsync)
+    при превышении порога, явном flush() или завершении процесса.
+    Буферы ключуются абсолютным путём; при ошибке записи данные остаются в буфере.
+    """
+    def __init__(self, flush_bytes: int = 64 * 1024, fsync: bool = False):
+        self.flush_bytes = flush_bytes
+        self.fsync = fsync
+        self._buffers = {}
+        self._sizes = {}
+        self._lock = threading.Lock()
+        _live_coalescers.add(self)
+
+    def append(self, path: str, data: bytes) -> int:
+        path = os.path.abspath(path)
+        # Запись на диск тоже под блокировкой, чтобы сохранить порядок дозаписей
+        with self._lock:
+            self._buffers.setdefault(path, []).append(bytes(data))
+            size = self._sizes.get(path, 0) + len(data)
+            self._sizes[path] = size
+            if size >= self.flush_bytes:
+                self._write(path)
+        return len(data)
+
+    def _write(self, path: str):
+        """Пишет буфер пути на диск; буфер удаляется только после успешной записи"""
+        chunks = self._buffers.get(path)
+        if not chunks:
+            return
+        ensure_parent_dir(path)
+        with open(path, "ab") as f:
+            f.write(b"".join(chunks))
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        del self._buffers[path]
+        self._sizes.pop(path, None)
+
+    def flush(self, paths=None):
+        """
+        Сбрасывает буферы указанных путей (None — всех).
+        Ошибка записи одного файла не мешает сбросу остальных; первая из них
+        поднимается после обхода, данные файла остаются в буфере.
+        """
+        error = None
+        with self._lock:
+            targets = list(self._buffers) if paths is None else [os.path.abspath(p) for p in paths]
+            for path in targets:
+                try:
+                    self._write(path)
+                except OSError as e:
+                    logger.error(f"Failed to flush buffered writes to {path}: {e}")
+                    error = error or e
+        if error is not None:
+            raise error
+
+    def pending_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+
+_live_coalescers = weakref.WeakSet()
+_shared_coalescers = {}
+_shared_lock = threading.Lock()
+
+
+def shared_coalescer(fsync: bool = False) -> WriteCoalescer:
+    """Общий для процесса буфер дозаписей: порядок записей в файл сохраняется между навыками"""
+    with _shared_lock:
+        coalescer = _shared_coalescers.get(fsync)
+        if coalescer is None:
+            coalescer = _shared_coalescers[fsync] = WriteCoalescer(fsync=fsync)
+        return coalescer
+
+
+@atexit.register
+def _flush_all():
+    for coalescer in list(_live_coalescers):
+        try:
+            coalescer.flush()
+        except Exception as e:
+            logger.error(f"Failed to flush buffered writes: {e}")
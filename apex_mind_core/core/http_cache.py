@@ -0,0 +1,135 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class CachedResponse:
+    """Сохранённое тело ответа вместе с валидаторами ETag/Last-Modified"""
+    __slots__ = ("body", "headers", "etag", "last_modified", "expires", "url", "vary")
+
+    def __init__(self, body: bytes, headers, url: str, expires: float, vary: tuple = ()):
+        self.body = body
+        self.headers = headers
+        self.url = url
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+        self.expires = expires
+        # Значения заголовков запроса из Vary ответа: ((имя, значение), ...)
+        self.vary = vary
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires
+
+
+class HTTPCache:
+    """
+    Кэш GET-ответов для условных запросов.
+    Хранит тело и валидаторы, пока свежий ответ отдаётся без сети,
+    устаревший — перепроверяется через If-None-Match/If-Modified-Since.
+    Размер ограничен бюджетом в байтах (LRU).
+    Ответы с Cache-Control: private и Vary: * не сохраняются; заголовки
+    из Vary ответа должны совпасть у запроса, а учётные данные запроса
+    входят в ключ, поэтому разные ключи API не делят одну запись.
+    """
+    # Заголовки запроса, от которых зависит содержимое ответа
+    VARY_HEADERS = ("Accept", "Accept-Language")
+    # Учётные данные: в ключ попадает только их хэш
+    CREDENTIAL_HEADERS = ("Authorization", "Proxy-Authorization", "Cookie", "X-API-Key")
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("HTTPCache")
+
+    @staticmethod
+    def _lowered(headers) -> dict:
+        return {k.lower(): v for k, v in (headers or {}).items()}
+
+    def key(self, url: str, headers: dict) -> tuple:
+        lowered = self._lowered(headers)
+        credentials = [lowered.get(h.lower(), "") for h in self.CREDENTIAL_HEADERS]
+        principal = (
+            hashlib.sha256("\0".join(credentials).encode("utf-8")).hexdigest()
+            if any(credentials) else ""
+        )
+        return (url, principal) + tuple(lowered.get(h.lower(), "") for h in self.VARY_HEADERS)
+
+    def get(self, key: tuple, headers: dict = None):
+        """Запись для ключа, если заголовки запроса совпадают с её Vary"""
+        lowered = self._lowered(headers)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if any(lowered.get(name, "") != value for name, value in entry.vary):
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def conditional_headers(self, entry: CachedResponse) -> dict:
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, key: tuple, body: bytes, headers, url: str, request_headers: dict = None):
+        cache_control = headers.get("Cache-Control", "").lower()
+        max_age = _MAX_AGE_RE.search(cache_control)
+        ttl = 0 if "no-cache" in cache_control or not max_age else int(max_age.group(1))
+        has_validators = bool(headers.get("ETag") or headers.get("Last-Modified"))
+        vary_names = [v.strip().lower() for v in headers.get("Vary", "").split(",") if v.strip()]
+        # Ответ без валидаторов и с нулевым сроком свежести переиспользовать нельзя;
+        # private — ответ для конкретного пользователя, кэш общий для навыков
+        storable = (
+            "no-store" not in cache_control
+            and "private" not in cache_control
+            and "*" not in vary_names
+            and (has_validators or ttl > 0)
+            and len(body) <= self.max_bytes
+        )
+        entry = None
+        if storable:
+            lowered = self._lowered(request_headers)
+            vary = tuple((name, lowered.get(name, "")) for name in vary_names)
+            entry = CachedResponse(body, headers, url, time.monotonic() + ttl, vary)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                # Прежняя запись устарела: сервер прислал новое тело
+                self._size -= len(previous.body)
+            if entry is None:
+                return
+            self._entries[key] = entry
+            self._size += len(body)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+
+    def refresh(self, key: tuple, headers):
+        """Продлевает свежесть записи после ответа 304"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        max_age = _MAX_AGE_RE.search(headers.get("Cache-Control", "").lower())
+        if max_age:
+            entry.expires = time.monotonic() + int(max_age.group(1))
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+http_cache = HTTPCache()
@@ -0,0 +1,75 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .dns_cache import dns_cache, install as install_dns_cache
+
+logger = logging.getLogger("HTTPSession")
+
+# Соединений на хост в пуле: параллельные миссии не открывают новые сверх этого
+POOL_SIZE = 32
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def shared_session() -> requests.Session:
+    """
+    Общая для процесса сессия requests с пулом keep-alive соединений.
+    ReptilianEngine создаётся на каждый поиск, поэтому собственная сессия
+    HTTPExecutor не переживала запрос и каждое соединение открывалось заново.
+    Сессия своя у каждого процесса: сокеты не наследуются через fork.
+    """
+    pid = os.getpid()
+    session = _sessions.get(pid)
+    if session is None:
+        with _lock:
+            session = _sessions.get(pid)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # Cookies не переносятся между миссиями, как и с отдельными сессиями
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _sessions.clear()
+                _sessions[pid] = session
+    return session
+
+
+def _warm_one(session: requests.Session, origin: str, timeout: float):
+    start = time.perf_counter()
+    try:
+        dns_cache.resolve(urlparse(origin).hostname)
+        # HEAD к корню: TLS-рукопожатие выполнено, соединение остаётся в пуле
+        session.head(origin, timeout=timeout, allow_redirects=False).close()
+        return time.perf_counter() - start
+    except Exception as e:
+        logger.warning(f"Prewarm of {origin} failed: {e}")
+        return e
+
+
+def prewarm(urls, timeout: float = 3.0) -> dict:
+    """
+    Разрешает имена и открывает соединения ко всем хостам из urls параллельно.
+    Возвращает {origin: секунды или исключение}.
+    """
+    origins = list(dict.fromkeys(
+        f"{parsed.scheme}://{parsed.netloc}/" for parsed in map(urlparse, urls)
+    ))
+    if not origins:
+        return {}
+    install_dns_cache()
+    session = shared_session()
+    with ThreadPoolExecutor(max_workers=len(origins)) as pool:
+        results = dict(zip(origins, pool.map(lambda o: _warm_one(session, o, timeout), origins)))
+    warmed = sum(1 for r in results.values() if not isinstance(r, Exception))
+    logger.info(f"Prewarmed {warmed}/{len(origins)} connections")
+    return results
@@ -0,0 +1,123 @@
+"""
+Единый JSON-кодек для ответов API и манифестов.
+
+Использует msgspec или orjson, если они установлены, иначе стандартный json.
+Для известных форм ответов поддерживается проекционное декодирование:
+decode_as(body, "ydc") возвращает только поля, которые читает оркестратор.
+С msgspec лишние поля пропускаются при разборе без создания объектов;
+с другими бэкендами тело разбирается целиком и проецируется.
+"""
+import json
+import logging
+
+try:
+    import msgspec
+except ImportError:  # msgspec — необязательная зависимость
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # orjson — необязательная зависимость
+    orjson = None
+
+if msgspec is not None:
+    BACKEND = "msgspec"
+elif orjson is not None:
+    BACKEND = "orjson"
+else:
+    BACKEND = "json"
+
+logger = logging.getLogger("JSONCodec")
+
+# Ошибки разбора всех бэкендов (json и orjson поднимают ValueError)
+DECODE_ERRORS = (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+
+
+def loads(data):
+    """Разбор JSON из bytes или str"""
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent: bool = False) -> str:
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def load_file(path: str):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_file(obj, path: str, indent: bool = True):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(dumps(obj, indent=indent))
+
+
+# Формы ответов: None — значение поля как есть, dict — объект с перечисленными
+# полями, [spec] — массив элементов формы spec
+SHAPES = {
+    "ydc": {"error": None, "hits": [{"description": None, "snippets": None}]},
+    "wiki_summary": {"extract": None},
+    "ddg": {"AbstractText": None, "RelatedTopics": [{"Text": None, "Topics": [{"Text": None}]}]},
+    "bing": {"webPages": {"value": [{"name": None, "snippet": None}]}},
+}
+
+
+def _project(value, spec):
+    if spec is None:
+        return value
+    if isinstance(spec, list):
+        if not isinstance(value, list):
+            return value
+        return [_project(item, spec[0]) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: _project(value[key], sub) for key, sub in spec.items() if key in value}
+
+
+def _struct_type(name: str, spec):
+    """msgspec-тип для формы: неизвестные поля пропускаются декодером"""
+    from typing import Any, List, Optional
+    if spec is None:
+        return Any
+    if isinstance(spec, list):
+        return List[_struct_type(name + "Item", spec[0])]
+    fields = [
+        (key, Optional[_struct_type(name + key.title(), sub)], None)
+        for key, sub in spec.items()
+    ]
+    return msgspec.defstruct(name, fields, omit_defaults=True)
+
+
+_decoders = {}
+if msgspec is not None:
+    _decoders = {
+        shape: msgspec.json.Decoder(_struct_type(shape.title().replace("_", ""), spec))
+        for shape, spec in SHAPES.items()
+    }
+
+
+def decode_as(data, shape: str) -> dict:
+    """
+    Разбор тела с проекцией на форму shape; результат — обычные dict/list.
+    Если на верхнем уровне не JSON-объект, возвращается пустой dict.
+    """
+    spec = SHAPES[shape]
+    if not data:
+        return {}
+    decoder = _decoders.get(shape)
+    if decoder is not None:
+        try:
+            return msgspec.to_builtins(decoder.decode(data))
+        except msgspec.ValidationError:
+            # Структура отличается от ожидаемой (другой тип поля) — общий путь
+            logger.debug(f"Response does not match '{shape}' shape, decoding fully")
+    result = _project(loads(data), spec)
+    # Вызывающий код ожидает объект: массив или скаляр на верхнем уровне — пустой ответ
+    return result if isinstance(result, dict) else {}
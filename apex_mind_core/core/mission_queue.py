@@ -0,0 +1,308 @@
+"""
+Очередь миссий для нескольких узлов.
+
+Производитель ставит миссию через enqueue(), воркеры забирают её через claim().
+Захваченная миссия невидима для других воркеров visibility_timeout секунд;
+если воркер не завершил её и не продлил захват (упал, завис, потерял узел),
+миссия снова становится доступной. Доставка — at-least-once.
+
+Бэкенд выбирается по URL очереди (APEX_QUEUE_URL), например
+sqlite:///var/lib/apex/queue.db. Встроенный SQLite-брокер не требует
+внешних сервисов; другие бэкенды подключаются через register_backend().
+"""
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_QUEUE_URL = "sqlite:///~/.apex/queue.db"
+DEFAULT_VISIBILITY_TIMEOUT = 300.0
+DEFAULT_MAX_ATTEMPTS = 5
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+logger = logging.getLogger("MissionQueue")
+
+
+@dataclass
+class QueuedMission:
+    id: str
+    mission: str
+    attempts: int
+    receipt: str
+
+
+class QueueBackend(ABC):
+    """Интерфейс бэкенда очереди миссий"""
+
+    @abstractmethod
+    def enqueue(self, mission: str) -> str:
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[QueuedMission]:
+        ...
+
+    @abstractmethod
+    def extend(self, receipt: str, visibility_timeout: float) -> bool:
+        ...
+
+    @abstractmethod
+    def complete(self, receipt: str, result) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, receipt: str, error: str, retry: bool = True) -> bool:
+        ...
+
+    @abstractmethod
+    def status(self, mission_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class SQLiteQueueBackend(QueueBackend):
+    """
+    Локальный брокер на SQLite.
+    Захват выполняется в транзакции BEGIN IMMEDIATE, поэтому несколько
+    процессов и воркеров на одном хосте не получат одну миссию одновременно.
+    Файловые блокировки SQLite ненадёжны на сетевых ФС: для нескольких узлов
+    файл базы должен лежать на одном хосте или использоваться другой бэкенд.
+    """
+    def __init__(self, path: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = os.path.expanduser(path)
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS missions (
+                    id TEXT PRIMARY KEY,
+                    mission TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    visible_at REAL NOT NULL,
+                    receipt TEXT,
+                    worker TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS missions_ready ON missions (status, visible_at, created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Соединение на поток: sqlite3 не разрешает делить его между потоками
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, mission: str) -> str:
+        mission_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO missions (id, mission, status, visible_at, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (mission_id, mission, STATUS_QUEUED, now, now, now)
+        )
+        return mission_id
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[QueuedMission]:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                row = conn.execute(
+                    "SELECT id, mission, attempts FROM missions "
+                    "WHERE status IN (?, ?) AND visible_at <= ? "
+                    "ORDER BY created_at LIMIT 1",
+                    (STATUS_QUEUED, STATUS_RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                attempts = row["attempts"] + 1
+                if attempts <= self.max_attempts:
+                    break
+                # Миссия исчерпала попытки (воркеры падали на ней) — в failed
+                # и берём следующую в той же транзакции
+                conn.execute(
+                    "UPDATE missions SET status = ?, error = ?, receipt = NULL, updated_at = ? WHERE id = ?",
+                    (STATUS_FAILED, f"Exceeded {self.max_attempts} delivery attempts", now, row["id"])
+                )
+
+            receipt = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE missions SET status = ?, attempts = ?, visible_at = ?, receipt = ?, "
+                "worker = ?, updated_at = ? WHERE id = ?",
+                (STATUS_RUNNING, attempts, now + visibility_timeout, receipt, worker_id, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return QueuedMission(row["id"], row["mission"], attempts, receipt)
+
+    def _update_claimed(self, receipt: str, assignments: str, params: tuple) -> bool:
+        # Квитанция меняется при каждой выдаче: воркер, у которого истёк
+        # захват, не перезапишет состояние миссии, отданной другому воркеру
+        cursor = self._connect().execute(
+            f"UPDATE missions SET {assignments}, updated_at = ? WHERE receipt = ? AND status = ?",
+            params + (time.time(), receipt, STATUS_RUNNING)
+        )
+        return cursor.rowcount == 1
+
+    def extend(self, receipt: str, visibility_timeout: float) -> bool:
+        return self._update_claimed(receipt, "visible_at = ?", (time.time() + visibility_timeout,))
+
+    def complete(self, receipt: str, result) -> bool:
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        return self._update_claimed(
+            receipt, "status = ?, result = ?, receipt = NULL", (STATUS_DONE, payload)
+        )
+
+    def fail(self, receipt: str, error: str, retry: bool = True) -> bool:
+        if retry:
+            return self._update_claimed(
+                receipt, "status = ?, error = ?, visible_at = ?, receipt = NULL",
+                (STATUS_QUEUED, error, time.time())
+            )
+        return self._update_claimed(
+            receipt, "status = ?, error = ?, receipt = NULL", (STATUS_FAILED, error)
+        )
+
+    def status(self, mission_id: str) -> Optional[dict]:
+        row = self._connect().execute(
+            "SELECT id, mission, status, attempts, worker, result, error, created_at, updated_at "
+            "FROM missions WHERE id = ?",
+            (mission_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        if record["result"] is not None:
+            record["result"] = json.loads(record["result"])
+        return record
+
+    def stats(self) -> dict:
+        rows = self._connect().execute(
+            "SELECT status, COUNT(*) AS n FROM missions GROUP BY status"
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+_BACKENDS = {
+    "sqlite": lambda location: SQLiteQueueBackend(location),
+}
+
+
+def register_backend(scheme: str, factory):
+    """Регистрирует бэкенд: factory(location) -> QueueBackend"""
+    _BACKENDS[scheme] = factory
+
+
+def open_queue(url: str = None) -> QueueBackend:
+    url = url or os.getenv("APEX_QUEUE_URL", DEFAULT_QUEUE_URL)
+    scheme, sep, location = url.partition("://")
+    if not sep or scheme not in _BACKENDS:
+        raise ValueError(f"Unsupported queue URL: {url}")
+    # sqlite:///abs/path -> /abs/path, sqlite:///~/x -> ~/x
+    if scheme == "sqlite" and location.startswith("/~"):
+        location = location[1:]
+    return _BACKENDS[scheme](location)
+
+
+class MissionWorker:
+    """
+    Потребитель очереди: забирает миссии, исполняет Orchestrator.executor
+    и сохраняет результат. Пока миссия выполняется, захват продлевается
+    фоновым потоком, так что длинные миссии не выдаются повторно.
+    """
+    def __init__(self, backend: QueueBackend, orchestrator, worker_id: str = None,
+                 visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+                 poll_interval: float = 1.0):
+        self.backend = backend
+        self.orchestrator = orchestrator
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.processed = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def process_one(self) -> bool:
+        """Выполняет одну миссию; False, если очередь пуста"""
+        item = self.backend.claim(self.worker_id, self.visibility_timeout)
+        if item is None:
+            return False
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(item.receipt, done), daemon=True)
+        heartbeat.start()
+        try:
+            result = self.orchestrator.executor({"mission": item.mission})
+        except Exception as e:
+            logger.error(f"Mission {item.id} failed on attempt {item.attempts}: {e}")
+            self.backend.fail(item.receipt, str(e))
+        else:
+            if not self.backend.complete(item.receipt, result):
+                logger.warning(f"Mission {item.id} was reclaimed before completion, result dropped")
+        finally:
+            done.set()
+            heartbeat.join()
+        self.processed += 1
+        return True
+
+    def _heartbeat(self, receipt: str, done: threading.Event):
+        interval = self.visibility_timeout / 3
+        while not done.wait(interval):
+            if not self.backend.extend(receipt, self.visibility_timeout):
+                return
+
+    def run(self, max_missions: int = None):
+        while not self._stop.is_set():
+            if max_missions is not None and self.processed >= max_missions:
+                return
+            if not self.process_one():
+                self._stop.wait(self.poll_interval)
+
+
+def wait_for_result(backend: QueueBackend, mission_id: str, timeout: float = None,
+                    poll_interval: float = 0.5) -> dict:
+    """Ожидает завершения миссии и возвращает её запись"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        record = backend.status(mission_id)
+        if record is None:
+            raise KeyError(f"Unknown mission: {mission_id}")
+        if record["status"] in (STATUS_DONE, STATUS_FAILED):
+            return record
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Mission {mission_id} did not finish in {timeout} s")
+        time.sleep(poll_interval)
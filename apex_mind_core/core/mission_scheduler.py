@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from .deadline import Deadline, DeadlineExceeded
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITY_BACKGROUND = "background"
+
+
+class MissionRejected(RuntimeError):
+    """Очередь класса приоритета заполнена — миссия отклонена (load shedding)"""
+
+
+@dataclass
+class PriorityClass:
+    name: str
+    # Меньше — важнее: свободный слот достаётся классу с наименьшим rank
+    rank: int
+    # Максимум одновременно выполняемых миссий класса
+    max_concurrency: int
+    # Максимум ожидающих миссий; при переполнении новые отклоняются
+    max_queue: int
+
+
+@dataclass
+class _ClassState:
+    spec: PriorityClass
+    queue: deque = field(default_factory=deque)
+    running: int = 0
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    expired: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    # Последние ожидания для перцентилей
+    waits: deque = field(default_factory=lambda: deque(maxlen=1024))
+
+
+def default_classes(workers: int) -> list:
+    """
+    Интерактивные миссии могут занять все потоки, пакетные — не больше
+    трёх четвертей, фоновые — половину. Общий потолок для всех классов,
+    кроме первого, задаёт MissionScheduler (reserved).
+    """
+    return [
+        PriorityClass(PRIORITY_INTERACTIVE, 0, workers, 64),
+        PriorityClass(PRIORITY_BATCH, 1, max(1, workers * 3 // 4), 1024),
+        PriorityClass(PRIORITY_BACKGROUND, 2, max(1, workers // 2), 4096),
+    ]
+
+
+class MissionScheduler:
+    """
+    Планировщик перед Orchestrator.executor для резидентного процесса.
+    Освободившийся поток берёт миссию самого приоритетного класса,
+    не исчерпавшего свой лимит concurrency. Очереди ограничены:
+    переполнение приводит к MissionRejected, а не к росту задержки.
+    Бюджет миссии (timeout) отсчитывается с момента постановки, поэтому
+    миссия, просидевшая в очереди весь бюджет, не запускается.
+    reserved потоков доступны только классу с наименьшим rank: все остальные
+    классы вместе не занимают больше workers - reserved.
+    """
+    def __init__(self, orchestrator, workers: int = 8, classes: list = None, reserved: int = None):
+        self.orchestrator = orchestrator
+        self.workers = workers
+        specs = sorted(classes or default_classes(workers), key=lambda c: c.rank)
+        self._classes = {spec.name: _ClassState(spec) for spec in specs}
+        self._order = [self._classes[spec.name] for spec in specs]
+        if reserved is None:
+            reserved = max(1, workers // 4) if len(specs) > 1 else 0
+        self.reserved = min(reserved, workers - 1) if len(specs) > 1 else 0
+        # Сколько сейчас выполняется миссий всех классов, кроме первого
+        self._shared_running = 0
+        self._cond = threading.Condition()
+        self._stop = False
+        self._threads = []
+        self.logger = logging.getLogger("MissionScheduler")
+
+    def start(self) -> "MissionScheduler":
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"mission-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, mission: str, priority: str = PRIORITY_BATCH, timeout: float = None) -> Future:
+        state = self._classes.get(priority)
+        if state is None:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        future = Future()
+        deadline = Deadline(timeout) if timeout is not None else None
+        with self._cond:
+            if self._stop:
+                raise RuntimeError("Mission scheduler is shut down")
+            if len(state.queue) >= state.spec.max_queue:
+                state.rejected += 1
+                raise MissionRejected(
+                    f"Queue for '{priority}' is full ({state.spec.max_queue} missions)"
+                )
+            state.queue.append((mission, deadline, time.monotonic(), future))
+            state.submitted += 1
+            self._cond.notify()
+        return future
+
+    def execute(self, mission: str, priority: str = PRIORITY_INTERACTIVE, timeout: float = None) -> dict:
+        """Синхронная постановка с ожиданием результата"""
+        return self.submit(mission, priority, timeout).result()
+
+    def _next(self):
+        shared_full = self._shared_running >= self.workers - self.reserved
+        for index, state in enumerate(self._order):
+            if index and shared_full:
+                break
+            if state.queue and state.running < state.spec.max_concurrency:
+                return state
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                state = self._next()
+                while state is None and not self._stop:
+                    self._cond.wait()
+                    state = self._next()
+                if state is None:
+                    return
+                mission, deadline, queued_at, future = state.queue.popleft()
+                waited = time.monotonic() - queued_at
+                state.wait_total += waited
+                state.wait_max = max(state.wait_max, waited)
+                state.waits.append(waited)
+                expired = deadline is not None and deadline.expired
+                if expired:
+                    state.expired += 1
+                else:
+                    state.running += 1
+                    shared = state is not self._order[0]
+                    if shared:
+                        self._shared_running += 1
+
+            if expired:
+                # Вне блокировки: Future, отменённый вызывающим, не должен
+                # уронить поток исключением InvalidStateError
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(DeadlineExceeded(
+                        f"Mission deadline exceeded after {waited:.3f}s in '{state.spec.name}' queue"
+                    ))
+                continue
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    mission_state = {"mission": mission}
+                    if deadline is not None:
+                        mission_state["deadline"] = deadline
+                    try:
+                        future.set_result(self.orchestrator.executor(mission_state))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    state.running -= 1
+                    state.completed += 1
+                    if shared:
+                        self._shared_running -= 1
+                    # Освободился слот класса — может стать доступной его очередь
+                    self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        with self._cond:
+            snapshot = {}
+            for state in self._order:
+                waits = sorted(state.waits)
+                dequeued = state.completed + state.running + state.expired
+                snapshot[state.spec.name] = {
+                    "queued": len(state.queue),
+                    "running": state.running,
+                    "submitted": state.submitted,
+                    "completed": state.completed,
+                    "rejected": state.rejected,
+                    "expired": state.expired,
+                    "wait_mean": state.wait_total / dequeued if dequeued else 0.0,
+                    "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                    "wait_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                    "wait_max": state.wait_max,
+                }
+        return snapshot
+
+    def shutdown(self, wait: bool = True):
+        with self._cond:
+            self._stop = True
+            abandoned = [item for state in self._order for item in state.queue]
+            for state in self._order:
+                state.queue.clear()
+            self._cond.notify_all()
+        for _, _, _, future in abandoned:
+            future.cancel()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -1,5 +1,4 @@
 import os
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import sys
 import io
@@ -9,11 +8,27 @@ load_dotenv()
 import urllib
 from apex_mind_core.core.state_manager import StateManager, AgentState
 from apex_mind_core.core.skill_registry import registry
+from apex_mind_core.core.content_filter import get_filter
+from apex_mind_core.core.transliteration import (
+    normalize_en_query,
+    enhanced_transliteration,
+    transliterate_ru_en
+)
 import requests
 from apex_mind_core.core.wasi_bridge import (
     ReptilianEngine, 
     HardwareOp, 
-    HardwareOpType
+    HardwareOpType,
+    HTTPExecutor
+)
+from apex_mind_core.core import json_codec, search_parsers
+from apex_mind_core.core.http_session import shared_session, prewarm
+from apex_mind_core.core.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    use_deadline,
+    call_timeout
 )
 import os
 from wasi_security_layer import (
@@ -23,9 +38,10 @@ from wasi_security_layer import (
     validate_sensor_access,
     validate_camera_access
 )
-import json
+from collections import OrderedDict
 import logging
 import re
+import threading
 
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -42,53 +58,119 @@ state_manager = StateManager()
 
 
 class SecurityEnforcer:
+    # Максимальное число запомненных решений по файловому доступу
+    DECISION_CACHE_SIZE = 1024
+    # Флаги манифеста проверяются Rust-функциями один раз при загрузке
+    PERMISSION_VALIDATORS = {
+        "gpu": validate_gpu_access,
+        "network": validate_network_access,
+        "sensors": validate_sensor_access,
+        "camera": validate_camera_access,
+    }
+
     def __init__(self, skill_name: str):
         self.skill_name = skill_name
         self.manifest_path = f"manifests/{skill_name}.json"
+        self.logger = logging.getLogger(f"SecurityEnforcer.{skill_name}")
+        self._decisions = OrderedDict()
+        self._lock = threading.Lock()
+        self._manifest_stamp = None
+        self._load_manifest()
+
+    def _stat_manifest(self):
+        st = os.stat(self.manifest_path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_manifest(self):
+        """Разбирает манифест один раз и сбрасывает кэш решений"""
+        # Сначала stat, потом чтение: если файл изменится между ними,
+        # устаревшая метка вызовет повторную загрузку, а не скроет изменение
+        self._manifest_stamp = self._stat_manifest()
         with open(self.manifest_path) as f:
             self.manifest_json = f.read()
-        self.logger = logging.getLogger(f"SecurityEnforcer.{skill_name}")
-    
+        self._decisions.clear()
+        try:
+            manifest = json_codec.loads(self.manifest_json)
+            # Строгая проверка схемы в Rust (serde): неверный тип или отсутствующее
+            # поле отклоняют манифест целиком, а не трактуются как разрешение
+            permissions = {
+                name: validate(self.manifest_json)
+                for name, validate in self.PERMISSION_VALIDATORS.items()
+            }
+            invalid = [name for name, value in permissions.items() if not isinstance(value, bool)]
+            if not isinstance(manifest, dict) or invalid:
+                raise ValueError(f"Invalid permission values: {invalid or 'not an object'}")
+        except Exception as e:
+            self.logger.error(f"Manifest validation failed, denying all access: {e}")
+            self.manifest = None
+            self._permissions = {}
+            return
+        self.manifest = manifest
+        self._permissions = permissions
+
+    def _refresh_if_changed(self):
+        try:
+            stamp = self._stat_manifest()
+        except OSError:
+            return
+        if stamp != self._manifest_stamp:
+            with self._lock:
+                if stamp != self._manifest_stamp:
+                    self.logger.info("Manifest changed, invalidating permission cache")
+                    self._load_manifest()
+
+    def _flag(self, name: str) -> bool:
+        self._refresh_if_changed()
+        if self.manifest is None:
+            return False
+        return self._permissions.get(name, False)
+
     def check_file_access(self, path: str, operation: str) -> bool:
+        self._refresh_if_changed()
+        if self.manifest is None:
+            return False
+
+        key = (path, operation)
+        with self._lock:
+            decision = self._decisions.get(key)
+            if decision is not None:
+                self._decisions.move_to_end(key)
+                return decision
+
         try:
-            return validate_file_access(path, self.manifest_json)
+            decision = validate_file_access(path, self.manifest_json)
         except Exception as e:
             self.logger.error(f"File access validation failed: {e}")
             return False
+
+        with self._lock:
+            self._decisions[key] = decision
+            if len(self._decisions) > self.DECISION_CACHE_SIZE:
+                self._decisions.popitem(last=False)
+        return decision
     
     def check_gpu_access(self) -> bool:
-        try:
-            return validate_gpu_access(self.manifest_json)
-        except Exception as e:
-            self.logger.error(f"GPU access validation failed: {e}")
-            return False
+        return self._flag("gpu")
     
     def check_network_access(self) -> bool:
-        try:
-            return validate_network_access(self.manifest_json)
-        except Exception as e:
-            self.logger.error(f"Network access validation failed: {e}")
-            return False
+        return self._flag("network")
     
     def check_sensor_access(self) -> bool:
-        try:
-            return validate_sensor_access(self.manifest_json)
-        except Exception as e:
-            self.logger.error(f"Sensor access validation failed: {e}")
-            return False
+        return self._flag("sensors")
     
     def check_camera_access(self) -> bool:
-        try:
-            return validate_camera_access(self.manifest_json)
-        except Exception as e:
-            self.logger.error(f"Camera access validation failed: {e}")
-            return False
+        return self._flag("camera")
 
 class Orchestrator:
+    # Файлы крупнее порога читаются и фильтруются потоком, без полной копии в памяти
+    STREAM_READ_BYTES = 1024 * 1024
+
     def __init__(self):
         from .logger import ExecutionTracker
         self.logger = ExecutionTracker()
         self.security_enforcers = {}
+        # Навыки из манифестов регистрируются заглушками и импортируются при первом вызове
+        registry.discover_manifests("manifests")
 
     def receive_mission(self, state: dict) -> dict:
         return state
@@ -109,7 +191,7 @@ class Orchestrator:
                 path = parsed["path"]
                 action = parsed["action"]
                 
-                enforcer = SecurityEnforcer("default")
+                enforcer = self.get_enforcer("default")
                 
                 if action == "read":
                     if enforcer.check_file_access(path, "read"):
@@ -122,6 +204,7 @@ class Orchestrator:
                     return "Запись запрещена"
             
             elif parsed["target"] == "network":
+                enforcer = self.get_enforcer("default")
                 if enforcer.check_network_access():
                     return "Операция разрешена"
                 return "Сетевой доступ запрещен"
@@ -237,22 +320,28 @@ class Orchestrator:
                 file_op.data = parsed["data"].encode()
 
             logger.debug(f"Executing file op: {file_op.path}")
-            result = engine.execute_hardware_op(file_op)
-
             if op_type == HardwareOpType.FileRead:
-                raw = result.decode('utf-8', errors='replace')
-                filtered = re.sub(r'[^ЁёА-Яа-я0-9\s]', '', raw).strip()
+                # Фильтр скомпилирован заранее; allowlist можно задать в манифесте навыка
+                content_filter = get_filter(engine._wasi_guard.manifest.content_filter)
+                if self._file_size(path) > self.STREAM_READ_BYTES:
+                    # Сырое содержимое не сохраняется: в памяти только один чанк и результат
+                    raw = None
+                    filtered = content_filter.filter_stream(engine.file_ops.iter_file(path))
+                else:
+                    raw = engine.execute_hardware_op(file_op).decode('utf-8', errors='replace')
+                    filtered = content_filter.filter(raw).strip()
                 state["result"] = {
                     "type": "file",
                     "content": raw,
                     "filtered": filtered
                 }
+                print(filtered)
             else:
+                engine.execute_hardware_op(file_op)
                 state["result"] = {"type": "file", "status": "written"}
 
             state["status"] = "completed"
             logger.info(f"File operation completed: {action} {path}")
-            print(filtered)
 
         except PermissionError as e:
             state["error"] = f"Permission denied: {e}"
@@ -263,6 +352,14 @@ class Orchestrator:
 
         return state
 
+    @staticmethod
+    def _file_size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            # Ошибку доступа или отсутствия файла сообщит обычный путь чтения
+            return 0
+
     def http_processing(self, state: dict) -> dict:
         parsed = state.get("parsed_command", {})
         
@@ -285,11 +382,33 @@ class Orchestrator:
             state["result"] = {"type": "http", "status_code": 200, "content": clean_text}
             state["status"] = "completed"
             logger.info(f"Search completed: {query}")
+        except DeadlineExceeded as e:
+            state["error"] = f"Search operation failed: {e}"
+            logger.warning(str(e))
         except Exception as e:
             state["error"] = f"Search operation failed: {e}"
             logger.exception(f"Search processing exception: {e}")
         return state
 
+    def search_endpoints(self) -> list:
+        """Хосты включённых источников поиска"""
+        endpoints = []
+        if os.getenv("YOU_API_KEY"):
+            endpoints.append("https://api.ydc-index.io/")
+        endpoints += [
+            "https://www.google.com/",
+            "https://ru.wikipedia.org/",
+            "https://en.wikipedia.org/",
+            "https://api.duckduckgo.com/",
+        ]
+        if os.getenv("BING_API_KEY"):
+            endpoints.append("https://api.bing.microsoft.com/")
+        return endpoints
+
+    def prewarm_connections(self, timeout: float = 3.0) -> dict:
+        """Для резидентного процесса: DNS и соединения ко всем источникам заранее"""
+        return prewarm(self.search_endpoints(), timeout)
+
     def try_sources(self, query: str) -> str:
         sources = [
             self.search_ydc,      # You.com API
@@ -302,7 +421,11 @@ class Orchestrator:
         if os.getenv("BING_API_KEY"):
             sources.insert(1, self.search_bing) 
 
+        deadline = current_deadline()
         for fn in sources:
+            # Источник, начатый после истечения бюджета, уже не нужен вызывающему
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceeded(f"Mission deadline exceeded while searching for {query!r}")
             try:
                 result = fn(query)
                 fn_name = fn.__name__ if hasattr(fn, '__name__') else 'lambda'
@@ -315,12 +438,12 @@ class Orchestrator:
 
         return "По вашему запросу ничего не найдено"
 
-    def _decode_response(self, res) -> str:
-        """Корректно получить текст из байт или Response"""
-        if isinstance(res, bytes):
-            return res.decode('utf-8', errors='replace')
-        if hasattr(res, 'text'):
-            return res.text
+    def _response_body(self, res):
+        """Сырое тело ответа для JSON-декодера, без промежуточного декодирования в str"""
+        if isinstance(res, (bytes, str)):
+            return res
+        if hasattr(res, 'content'):
+            return res.content
         return str(res)
 
     def search_google(self, query: str) -> str:
@@ -337,30 +460,9 @@ class Orchestrator:
         }
 
         res = ReptilianEngine("WebSearch").execute_hardware_op(op)
-        raw = self._decode_response(res)
-        logger.debug(f"Raw Google: {raw[:300]!r}")
-
-        soup = BeautifulSoup(raw, 'html.parser')
-        result = []
-
-        for snippet in soup.select('.V3FYCf, .t2sad, .hgKElc'):
-            if text := snippet.get_text(strip=True, separator=' '):
-                result.append(text)
-
-        if not result:
-            for answer in soup.select('.LGOjhe, .LTKOO, .sW6dbe'):
-                if text := answer.get_text(strip=True, separator=' '):
-                    result.append(text)
-
-        if not result:
-            for container in soup.select('.g'):
-                title = container.select_one('h3') or container.select_one('.DKV0Hd')
-                snippet = container.select_one('.VwiC3b, .MUxGbd') or container.select_one('.lEBKkf')
-
-                if title and snippet:
-                    result.append(f"{title.get_text(strip=True)}: {snippet.get_text(strip=True, separator=' ')}")
-
-        return ' '.join(result[:3]) if result else ""
+        body = self._response_body(res)
+        logger.debug(f"Raw Google: {body[:300]!r}")
+        return search_parsers.parse("google", body)
     
 
     def search_ydc(self, query: str) -> str:
@@ -382,28 +484,15 @@ class Orchestrator:
             }
     
             res = ReptilianEngine("WebSearch").execute_hardware_op(op)
-            raw_response = self._decode_response(res)
-            
-            if "error" in raw_response:
-                error_data = json.loads(raw_response)
-                logger.error(f"You.com API error: {error_data.get('error', 'Unknown error')}")
-                return ""
-            
-            response = json.loads(raw_response)
-            logger.debug(f"You.com YDC response: {json.dumps(response, ensure_ascii=False)[:500]}")
-    
-            all_text = []
-            for hit in response.get("hits", [])[:5]:  
-                if "description" in hit and hit["description"]:
-                    all_text.append(hit["description"])
-                
-                for snippet in hit.get("snippets", []):
-                    if snippet.strip():  
-                        all_text.append(snippet)
-                        
-            return " ".join(all_text) if all_text else ""
+            body = self._response_body(res)
+            logger.debug(f"You.com YDC response: {body[:500]!r}")
+
+            return search_parsers.parse("ydc", body)
     
-        except json.JSONDecodeError as e:
+        except search_parsers.SourceError as e:
+            logger.error(str(e))
+            return ""
+        except json_codec.DECODE_ERRORS as e:
             logger.error(f"Failed to parse You.com response: {e}")
             return ""
         except Exception as e:
@@ -412,8 +501,6 @@ class Orchestrator:
     
 
     def search_bing(self, query: str) -> str:
-        import requests
-
         subscription_key = os.getenv("BING_API_KEY")
         if not subscription_key:
             raise ValueError("BING_API_KEY не установлен в переменных окружения")
@@ -422,19 +509,12 @@ class Orchestrator:
         headers = {"Ocp-Apim-Subscription-Key": subscription_key}
         params = {"q": query, "mkt": "ru-RU"}
 
-        response = requests.get(endpoint, headers=headers, params=params)
-        data = response.json()
-        logger.debug(f"Raw Bing response: {json.dumps(data, ensure_ascii=False)[:500]}")
-
-        results = []
-        if "webPages" in data:
-            for item in data["webPages"]["value"][:3]:
-                title = item.get("name")
-                snippet = item.get("snippet")
-                if title and snippet:
-                    results.append(f"{title}: {snippet}")
-
-        return ' '.join(results) if results else "По вашему запросу ничего не найдено"
+        response = shared_session().get(
+            endpoint, headers=headers, params=params,
+            timeout=call_timeout(HTTPExecutor.DEFAULT_TIMEOUT, "Bing search")
+        )
+        logger.debug(f"Raw Bing response: {response.content[:500]!r}")
+        return search_parsers.parse("bing", response.content)
 
     def _search_wikipedia(self, query: str, lang: str) -> str:
         if lang == "ru":
@@ -455,59 +535,22 @@ class Orchestrator:
 
         try:
             res = ReptilianEngine("WebSearch").execute_hardware_op(op)
-            raw = self._decode_response(res)
-            logger.debug(f"Raw Wiki {lang.upper()}: {raw[:300]!r}")
+            body = self._response_body(res)
+            logger.debug(f"Raw Wiki {lang.upper()}: {body[:300]!r}")
 
-            data = json.loads(raw)
-            return data.get("extract", "")
+            return search_parsers.parse("wikipedia", body)
         except Exception as e:
             logger.error(f"Wikipedia error: {e}")
             return ""
 
     def _correct_english_names(self, text: str) -> str:
-        corrections = {
-            "илон маск": "Elon Musk",
-            "битокин": "Bitcoin",
-            "кубик рубика": "Rubik's Cube"
-        }
-
-        for ru, en in corrections.items():
-            if ru in text.lower():
-                return en
-
-        return self._enhanced_transliteration(text)
+        return normalize_en_query(text)
 
     def _enhanced_transliteration(self, text: str) -> str:
-        translit_map = {
-            'илон': 'elon', 'маск': 'musk',
-            'битокин': 'bitcoin', 'биткоин': 'bitcoin',
-            'рубик': 'rubik', 'кубик': 'cube'
-        }
-
-        for ru, en in translit_map.items():
-            text = re.sub(rf'\b{ru}\b', en, text, flags=re.IGNORECASE)
-
-        return self._transliterate_ru_en(text)
+        return enhanced_transliteration(text)
 
     def _transliterate_ru_en(self, text: str) -> str:
-        translit_map = {
-            'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
-            'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
-            'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
-            'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
-            'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
-        }
-        
-        result = []
-        for char in text.lower():
-            if char in translit_map:
-                result.append(translit_map[char])
-            elif char in ' -_':
-                result.append('_')
-            else:
-                result.append(char)
-        
-        return ''.join(result)
+        return transliterate_ru_en(text)
 
     def search_ddg(self, query: str) -> str:
         q = query.strip().strip('"')
@@ -515,15 +558,9 @@ class Orchestrator:
         op = HardwareOp(HardwareOpType.NetworkRequest)
         op.url = url; op.method = "GET"; op.headers = {"User-Agent": "ApexMind/1.0"}
         res = ReptilianEngine("WebSearch").execute_hardware_op(op)
-        raw = self._decode_response(res)
-        logger.debug(f"Raw DDG: {raw[:300]!r}")
-        data = json.loads(raw or '{}')
-        if data.get("AbstractText"): return data["AbstractText"]
-        for topic in data.get("RelatedTopics", []):
-            if "Text" in topic: return topic["Text"]
-            for sub in topic.get("Topics", []):
-                if "Text" in sub: return sub["Text"]
-        return ""
+        body = self._response_body(res)
+        logger.debug(f"Raw DDG: {body[:300]!r}")
+        return search_parsers.parse("ddg", body)
 
         
     def conscience_check(self, state: dict) -> dict:
@@ -532,10 +569,28 @@ class Orchestrator:
     def finalize_execution(self, state: dict) -> dict:
         return state
 
+    def _mission_deadline(self, state: dict) -> Deadline:
+        """Дедлайн миссии: state["deadline"], state["timeout"] (с) или внешний контекст"""
+        deadline = state.get("deadline")
+        if isinstance(deadline, Deadline):
+            return deadline
+        if state.get("timeout") is not None:
+            return Deadline(float(state["timeout"]))
+        return current_deadline()
+
     def executor(self, state: dict) -> dict:
         if not state.get('mission'):
             return {"context": "No mission text provided"}
 
+        deadline = self._mission_deadline(state)
+        # Сам объект дедлайна в состоянии не храним: результат должен оставаться сериализуемым
+        state = {k: v for k, v in state.items() if k != "deadline"}
+        if deadline is None:
+            return self._execute(state)
+        with use_deadline(deadline):
+            return self._execute(state)
+
+    def _execute(self, state: dict) -> dict:
         try:
             state = self.mission_parser(state)
             state = self.basic_router(state)
@@ -561,6 +616,14 @@ class Orchestrator:
         
     def register_skill(self, skill_name: str):
         self.security_enforcers[skill_name] = SecurityEnforcer(skill_name)
+
+    def get_enforcer(self, skill_name: str) -> SecurityEnforcer:
+        """Возвращает закэшированный SecurityEnforcer, создавая его при первом обращении"""
+        enforcer = self.security_enforcers.get(skill_name)
+        if enforcer is None:
+            enforcer = SecurityEnforcer(skill_name)
+            self.security_enforcers[skill_name] = enforcer
+        return enforcer
     
     def execute_operation(self, skill_name: str, operation):
         enforcer = self.security_enforcers.get(skill_name)
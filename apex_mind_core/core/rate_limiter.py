@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+
+
+class TokenBucket:
+    """Token bucket: rate токенов в секунду, не более burst накоплено"""
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        # Временный bucket (домен без лимита после 429) удаляется после этого момента
+        self.expires_at = None
+
+    def reserve(self, now: float) -> float:
+        """Резервирует токен и возвращает, сколько секунд нужно подождать"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Токены могут уйти в минус: так потоки встают в очередь, а не гоняются за одним токеном
+        self.tokens -= 1.0
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+
+class DomainRateLimiter:
+    """
+    Общий для всех потоков ограничитель запросов по доменам.
+    Лимиты задаются в манифесте секцией "rate_limits":
+        {"en.wikipedia.org": {"rate": 10, "burst": 20}}
+    Домены без лимита не ограничиваются.
+    """
+    # Верхняя граница паузы по Retry-After, чтобы миссия не зависала надолго
+    MAX_BACKOFF = 60.0
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("DomainRateLimiter")
+
+    def configure(self, limits: dict):
+        with self._lock:
+            for domain, spec in (limits or {}).items():
+                rate = spec.get("rate")
+                if not rate or rate <= 0:
+                    continue
+                burst = spec.get("burst")
+                bucket = self._buckets.get(domain)
+                if (bucket is None or bucket.expires_at is not None or bucket.rate != rate
+                        or (burst is not None and bucket.burst != burst)):
+                    self._buckets[domain] = TokenBucket(rate, burst)
+
+    def acquire(self, domain: str, max_wait: float = None) -> float:
+        """
+        Блокирует поток до появления токена для домена; возвращает время ожидания.
+        Если ждать пришлось бы дольше max_wait, токен возвращается и
+        поднимается TimeoutError.
+        """
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                return 0.0
+            now = time.monotonic()
+            if bucket.expires_at is not None and now >= bucket.expires_at:
+                # Пауза после 429 закончилась — домен снова без ограничений
+                del self._buckets[domain]
+                return 0.0
+            wait = bucket.reserve(now)
+            if max_wait is not None and wait > max_wait:
+                bucket.tokens += 1.0
+                raise TimeoutError(
+                    f"Rate limit for {domain} requires waiting {wait:.1f}s, budget is {max_wait:.1f}s"
+                )
+        if wait > 0:
+            self.logger.debug(f"Pacing request to {domain}: waiting {wait:.3f}s")
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, domain: str, seconds: float):
+        """Приостанавливает домен после ответа 429 (Retry-After)"""
+        seconds = min(seconds, self.MAX_BACKOFF)
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                # Домен без лимита в манифесте, но сервер уже отказывает — ограничиваем
+                # осторожно, пока длится пауза
+                bucket = self._buckets[domain] = TokenBucket(1.0)
+                bucket.expires_at = 0.0
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + seconds)
+            if bucket.expires_at is None:
+                bucket.tokens = min(bucket.tokens, 0.0)
+            else:
+                # Временный bucket только удерживает запросы до конца паузы
+                bucket.expires_at = bucket.blocked_until
+        self.logger.warning(f"Rate limited by {domain}, backing off for {seconds:.1f}s")
+
+
+rate_limiter = DomainRateLimiter()
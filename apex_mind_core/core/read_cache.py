@@ -0,0 +1,71 @@
+import os
+import threading
+from collections import OrderedDict
+
+
+class FileReadCache:
+    """
+    LRU-кэш содержимого файлов с бюджетом в байтах.
+    Запись действительна, пока совпадает отпечаток (inode, mtime, size);
+    возвращаемые bytes неизменяемы и разделяются между всеми читателями.
+    """
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def stamp(st: os.stat_result) -> tuple:
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str, stamp: tuple):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, path: str, stamp: tuple, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[path] = (stamp, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def invalidate(self, path: str):
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._size -= len(entry[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def shared_read_cache(max_bytes: int = None) -> FileReadCache:
+    """Общий для процесса кэш чтения (для резидентного воркера)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FileReadCache(max_bytes or 64 * 1024 * 1024)
+        elif max_bytes and max_bytes > _shared_cache.max_bytes:
+            _shared_cache.max_bytes = max_bytes
+        return _shared_cache
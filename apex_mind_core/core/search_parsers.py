@@ -0,0 +1,183 @@
+"""
+Разбор ответов источников поиска, отделённый от загрузки.
+
+Каждый парсер — чистая функция верхнего уровня: сырые байты тела на входе,
+текст сниппетов на выходе. Поэтому разбор можно выполнять в пуле процессов:
+BeautifulSoup и декодирование крупного JSON не держат GIL потоков,
+которые в это время загружают ответы для других миссий.
+
+Пул включается через configure_pool(workers) или APEX_PARSE_WORKERS;
+без него разбор идёт в вызывающем потоке, как раньше. Процессы пула
+запускаются при первом разборе крупного ответа через forkserver или spawn:
+fork многопоточного процесса мог бы унаследовать захваченные блокировки.
+"""
+import logging
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from bs4 import BeautifulSoup
+
+from . import json_codec
+from .deadline import DeadlineExceeded, call_timeout
+
+logger = logging.getLogger("SearchParsers")
+
+
+class SourceError(Exception):
+    """Источник вернул ошибку в теле ответа"""
+
+
+def _decode(body) -> str:
+    return body.decode("utf-8", errors="replace") if isinstance(body, bytes) else body
+
+
+def parse_google(body) -> str:
+    soup = BeautifulSoup(_decode(body), 'html.parser')
+    result = []
+
+    for snippet in soup.select('.V3FYCf, .t2sad, .hgKElc'):
+        if text := snippet.get_text(strip=True, separator=' '):
+            result.append(text)
+
+    if not result:
+        for answer in soup.select('.LGOjhe, .LTKOO, .sW6dbe'):
+            if text := answer.get_text(strip=True, separator=' '):
+                result.append(text)
+
+    if not result:
+        for container in soup.select('.g'):
+            title = container.select_one('h3') or container.select_one('.DKV0Hd')
+            snippet = container.select_one('.VwiC3b, .MUxGbd') or container.select_one('.lEBKkf')
+
+            if title and snippet:
+                result.append(f"{title.get_text(strip=True)}: {snippet.get_text(strip=True, separator=' ')}")
+
+    return ' '.join(result[:3]) if result else ""
+
+
+def parse_ydc(body) -> str:
+    # Тело разбирается один раз, только нужные поля
+    response = json_codec.decode_as(body, "ydc")
+    if response.get("error"):
+        raise SourceError(f"You.com API error: {response['error']}")
+
+    all_text = []
+    for hit in response.get("hits", [])[:5]:
+        if "description" in hit and hit["description"]:
+            all_text.append(hit["description"])
+
+        for snippet in hit.get("snippets", []):
+            if snippet.strip():
+                all_text.append(snippet)
+
+    return " ".join(all_text) if all_text else ""
+
+
+def parse_wikipedia(body) -> str:
+    return json_codec.decode_as(body, "wiki_summary").get("extract") or ""
+
+
+def parse_ddg(body) -> str:
+    data = json_codec.decode_as(body, "ddg")
+    if data.get("AbstractText"):
+        return data["AbstractText"]
+    for topic in data.get("RelatedTopics", []):
+        if "Text" in topic:
+            return topic["Text"]
+        for sub in topic.get("Topics", []):
+            if "Text" in sub:
+                return sub["Text"]
+    return ""
+
+
+def parse_bing(body) -> str:
+    data = json_codec.decode_as(body, "bing")
+    results = []
+    if "webPages" in data:
+        for item in data["webPages"]["value"][:3]:
+            title = item.get("name")
+            snippet = item.get("snippet")
+            if title and snippet:
+                results.append(f"{title}: {snippet}")
+
+    return ' '.join(results) if results else "По вашему запросу ничего не найдено"
+
+
+PARSERS = {
+    "google": parse_google,
+    "ydc": parse_ydc,
+    "wikipedia": parse_wikipedia,
+    "ddg": parse_ddg,
+    "bing": parse_bing,
+}
+
+# Тела меньше порога разбираются на месте: передача в процесс обойдётся дороже
+INLINE_BYTES = 32 * 1024
+
+_pool = None
+# None — число процессов ещё не задано: читается из APEX_PARSE_WORKERS при первом разборе
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def configure_pool(workers: int):
+    """Включает пул процессов для разбора (0 — выключить); процессы стартуют при первом разборе"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        previous, _pool = _pool, None
+        _pool_workers = max(0, workers)
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def shutdown_pool():
+    configure_pool(0)
+
+
+def _get_pool():
+    global _pool, _pool_workers
+    if _pool_workers == 0:
+        return None
+    with _pool_lock:
+        if _pool_workers is None:
+            _pool_workers = int(os.getenv("APEX_PARSE_WORKERS") or 0)
+        if _pool is None and _pool_workers > 0:
+            method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=mp.get_context(method))
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is not pool:
+            return
+        _pool = None
+    pool.shutdown(wait=False)
+
+
+def parse(source: str, body) -> str:
+    """Разбирает тело ответа источника — в пуле процессов, если он включён"""
+    parser = PARSERS[source]
+    if len(body) < INLINE_BYTES:
+        return parser(body)
+    pool = _get_pool()
+    if pool is None:
+        return parser(body)
+
+    try:
+        future = pool.submit(parser, body)
+        # Поток ждёт без GIL; ожидание ограничено дедлайном миссии
+        return future.result(timeout=call_timeout(None, f"parsing {source} response"))
+    except FutureTimeoutError:
+        future.cancel()
+        raise DeadlineExceeded(f"Mission deadline exceeded while parsing {source} response")
+    except BrokenProcessPool as e:
+        # Процесс пула погиб (например, OOM) — разбор этого ответа на месте,
+        # следующий крупный ответ запустит новый пул
+        logger.error(f"Parse pool is broken ({e}), parsing {source} response inline")
+        _discard_pool(pool)
+        return parser(body)
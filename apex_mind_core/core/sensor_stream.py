@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy — необязательная зависимость
+    np = None
+
+
+class RingBuffer:
+    """Кольцевой буфер фиксированного размера на массивах NumPy (значения и метки времени)"""
+    def __init__(self, capacity: int):
+        if np is None:
+            raise ImportError("NumPy is required for sensor streams")
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = capacity
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._head = 0      # индекс следующей записи
+        self._count = 0
+        self.total = 0      # всего записано за время жизни буфера
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def extend(self, values, timestamps):
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        if n > self.capacity:
+            values, timestamps = values[-self.capacity:], timestamps[-self.capacity:]
+            n = self.capacity
+        with self._lock:
+            first = min(n, self.capacity - self._head)
+            self._values[self._head:self._head + first] = values[:first]
+            self._timestamps[self._head:self._head + first] = timestamps[:first]
+            if first < n:
+                self._values[:n - first] = values[first:]
+                self._timestamps[:n - first] = timestamps[first:]
+            self._head = (self._head + n) % self.capacity
+            self._count = min(self.capacity, self._count + n)
+            self.total += n
+
+    def append(self, value: float, timestamp: float):
+        self.extend((value,), (timestamp,))
+
+    def _indices(self, n: int):
+        n = self._count if n is None else min(n, self._count)
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return slice(start, start + n)
+        return np.r_[start:self.capacity, 0:(start + n) % self.capacity]
+
+    def latest(self, n: int = None, with_timestamps: bool = False):
+        """Последние n значений (копия) в хронологическом порядке"""
+        with self._lock:
+            idx = self._indices(n)
+            values = self._values[idx].copy()
+            if with_timestamps:
+                return values, self._timestamps[idx].copy()
+            return values
+
+    def aggregate(self, n: int = None) -> dict:
+        """Скользящие агрегаты по последним n значениям"""
+        values = self.latest(n)
+        if not len(values):
+            return {"count": 0}
+        return {
+            "count": int(len(values)),
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "std": float(values.std()),
+        }
+
+
+class SensorStream:
+    """
+    Фоновая выборка датчика с заданной частотой в кольцевой буфер.
+    Разрешение манифеста проверяется один раз при создании потока,
+    далее датчик опрашивается напрямую, без диспетчеризации HardwareOp.
+    """
+    def __init__(self, reader, sensor_type: str, rate_hz: float, capacity: int = 4096):
+        if rate_hz <= 0:
+            raise ValueError("Sampling rate must be positive")
+        self.reader = reader
+        self.sensor_type = sensor_type
+        self.rate_hz = rate_hz
+        self.buffer = RingBuffer(capacity)
+        self.logger = logging.getLogger(f"SensorStream.{sensor_type}")
+        self._stop = threading.Event()
+        self._thread = None
+        self.error = None
+        # Такты, пропущенные из-за медленного чтения: отсчёты за них не досчитываются
+        self.missed = 0
+
+    def start(self) -> "SensorStream":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"sensor-{self.sensor_type}", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        start = time.monotonic()
+        tick = 0
+        try:
+            while not self._stop.is_set():
+                # Метка — фактическое время чтения, а не плановое время такта
+                stamp = time.monotonic()
+                self.buffer.append(self.reader(self.sensor_type), stamp)
+                now = time.monotonic()
+                # Расписание привязано к start, поэтому дрейф не копится; такты,
+                # которые уже прошли, пропускаются и учитываются в missed
+                next_tick = max(tick + 1, int((now - start) * self.rate_hz) + 1)
+                self.missed += next_tick - tick - 1
+                tick = next_tick
+                self._stop.wait(max(0.0, start + tick * period - now))
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"Sensor sampling stopped: {e}")
+
+    def read(self, n: int = None, with_timestamps: bool = False):
+        return self.buffer.latest(n, with_timestamps)
+
+    def aggregate(self, n: int = None) -> dict:
+        return self.buffer.aggregate(n)
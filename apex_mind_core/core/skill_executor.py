@@ -0,0 +1,213 @@
+import contextvars
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Callable
+
+from .deadline import DeadlineExceeded, current_deadline
+
+# Профили выполнения навыков
+PROFILE_IO = "io"
+PROFILE_CPU = "cpu"
+
+
+# Процесс навыка запускается не fork'ом: родитель многопоточный, и дочерний
+# процесс мог бы унаследовать блокировку, захваченную другим потоком
+_process_context = mp.get_context(
+    "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+)
+
+
+class SkillTimeoutError(TimeoutError):
+    """Навык не уложился в объявленный таймаут"""
+
+
+def _process_main(conn, function, input_data):
+    try:
+        outcome = ("ok", function(input_data))
+    except Exception as e:
+        outcome = ("error", e)
+    try:
+        conn.send(outcome)
+    except Exception as e:
+        # Результат или исключение не сериализуются
+        conn.send(("error", RuntimeError(f"Skill result cannot be returned: {e}")))
+    finally:
+        conn.close()
+
+
+def _run_in_process(skill_name: str, function, input_data, expires_at: float = None):
+    """
+    Выполняет CPU-навык в собственном процессе. По истечении таймаута процесс
+    завершается: зависший навык не продолжает занимать процессор и слот.
+    """
+    if expires_at is not None and expires_at <= time.monotonic():
+        raise SkillTimeoutError(f"Skill '{skill_name}' timed out before start")
+
+    receiver, sender = _process_context.Pipe(duplex=False)
+    process = _process_context.Process(target=_process_main, args=(sender, function, input_data),
+                         name=f"skill-{skill_name}", daemon=True)
+    process.start()
+    sender.close()
+    try:
+        timeout = None if expires_at is None else max(0.0, expires_at - time.monotonic())
+        if not receiver.poll(timeout):
+            process.terminate()
+            raise SkillTimeoutError(f"Skill '{skill_name}' process terminated after timeout")
+        try:
+            status, value = receiver.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"Skill '{skill_name}' process exited with code {process.exitcode}")
+    finally:
+        receiver.close()
+        process.join()
+
+    if status == "error":
+        raise value
+    return value
+
+
+class SkillExecutor:
+    """
+    Асинхронное выполнение навыков.
+    I/O-навыки уходят в пул потоков. CPU-навык выполняется в отдельном
+    процессе, который завершается по таймауту; число одновременно
+    работающих процессов ограничено cpu_workers. Для каждого навыка
+    соблюдаются лимит одновременных запусков и таймаут.
+    """
+    def __init__(self, io_workers: int = 16, cpu_workers: int = None):
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.logger = logging.getLogger("SkillExecutor")
+        self._io_pool = None
+        self._cpu_pool = None
+        self._lock = threading.Lock()
+        self._running = {}
+        self._pending = {}
+
+    def _pool(self, profile: str):
+        with self._lock:
+            if profile == PROFILE_CPU:
+                if self._cpu_pool is None:
+                    # Потоки только ждут свои процессы навыков
+                    self._cpu_pool = ThreadPoolExecutor(
+                        max_workers=self.cpu_workers, thread_name_prefix="skill-cpu"
+                    )
+                return self._cpu_pool
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(
+                    max_workers=self.io_workers, thread_name_prefix="skill-io"
+                )
+            return self._io_pool
+
+    def submit(self, skill, function: Callable[[str], str], input_data: str) -> Future:
+        """Ставит навык в очередь и возвращает Future с его результатом"""
+        outer = Future()
+        # Дедлайн миссии фиксируется при постановке: навык, отложенный лимитом
+        # concurrency, не стартует, если его бюджет уже исчерпан
+        task = (skill, function, input_data, outer, current_deadline())
+
+        with self._lock:
+            running = self._running.get(skill.name, 0)
+            if skill.max_concurrency and running >= skill.max_concurrency:
+                # Лимит исчерпан: запуск отложен до завершения одного из текущих
+                self._pending.setdefault(skill.name, deque()).append(task)
+                return outer
+            self._running[skill.name] = running + 1
+
+        self._dispatch(task)
+        return outer
+
+    def _dispatch(self, task):
+        skill, function, input_data, outer, deadline = task
+
+        if not outer.set_running_or_notify_cancel():
+            self._release(skill.name)
+            return
+
+        timeout = skill.timeout
+        if deadline is not None:
+            remaining = deadline.remaining()
+            if remaining == 0.0:
+                outer.set_exception(DeadlineExceeded(f"Mission deadline exceeded before skill '{skill.name}'"))
+                self._release(skill.name)
+                return
+            if remaining is not None and (not timeout or remaining < timeout):
+                timeout = remaining
+
+        try:
+            if skill.profile == PROFILE_CPU:
+                expires_at = time.monotonic() + timeout if timeout else None
+                inner = self._pool(skill.profile).submit(
+                    _run_in_process, skill.name, function, input_data, expires_at
+                )
+            else:
+                # I/O-навык видит дедлайн миссии в своих HTTP- и файловых вызовах
+                context = contextvars.copy_context()
+                inner = self._pool(skill.profile).submit(context.run, function, input_data)
+        except Exception as e:
+            outer.set_exception(e)
+            self._release(skill.name)
+            return
+
+        timer = None
+        if timeout:
+            timer = threading.Timer(timeout, self._expire, args=(skill, outer, timeout))
+            timer.daemon = True
+            timer.start()
+
+        def _done(f):
+            if timer is not None:
+                timer.cancel()
+            try:
+                result = f.result()
+            except Exception as e:
+                self._settle(outer, exception=e)
+            else:
+                self._settle(outer, result=result)
+            # Слот освобождается только когда работа реально завершилась
+            self._release(skill.name)
+
+        inner.add_done_callback(_done)
+
+    @staticmethod
+    def _settle(outer: Future, result=None, exception: Exception = None):
+        try:
+            if exception is not None:
+                outer.set_exception(exception)
+            else:
+                outer.set_result(result)
+        except InvalidStateError:
+            # Future уже завершён таймаутом или отменой
+            pass
+
+    def _expire(self, skill, outer: Future, timeout: float):
+        if outer.done():
+            return
+        self.logger.warning(f"Skill {skill.name} exceeded timeout of {timeout:g}s")
+        self._settle(
+            outer,
+            exception=SkillTimeoutError(f"Skill '{skill.name}' timed out after {timeout:g}s")
+        )
+
+    def _release(self, skill_name: str):
+        with self._lock:
+            pending = self._pending.get(skill_name)
+            if pending:
+                task = pending.popleft()
+            else:
+                self._running[skill_name] = max(0, self._running.get(skill_name, 1) - 1)
+                return
+        self._dispatch(task)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pools = [p for p in (self._io_pool, self._cpu_pool) if p is not None]
+            self._io_pool = self._cpu_pool = None
+        for pool in pools:
+            pool.shutdown(wait=wait)
@@ -1,22 +1,125 @@
 from pydantic import BaseModel
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Optional
 from apex_mind_core.core.capability_registry import CapabilityRegistry
+from apex_mind_core.core.skill_executor import SkillExecutor, SkillTimeoutError, PROFILE_IO, PROFILE_CPU
+from apex_mind_core.core.deadline import DeadlineExceeded, current_deadline
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import importlib
+import json
+import logging
+import os
+import threading
 
-cap_reg = CapabilityRegistry()
+# Крупные каталоги возможностей можно загрузить из файла
+if os.getenv("APEX_CAPABILITIES_FILE"):
+    cap_reg = CapabilityRegistry.from_file(os.environ["APEX_CAPABILITIES_FILE"])
+else:
+    cap_reg = CapabilityRegistry()
+logger = logging.getLogger("SkillRegistry")
+
+# Группа entry points, через которую сторонние пакеты объявляют навыки
+SKILL_ENTRY_POINT_GROUP = "apex_mind.skills"
 
 class Skill(BaseModel):
     name: str
     description: str
-    function: Callable[[str], str]
+    # None для ленивых навыков: функция импортируется при первом вызове
+    function: Optional[Callable[[str], str]] = None
+    # "package.module:function" для ленивой загрузки
+    entry_point: str = ""
     input_schema: Dict[str, Any] = {}
     required_capabilities: list = []
+    # Профиль выполнения для submit(): "io" — пул потоков, "cpu" — отдельный
+    # процесс на вызов (функция должна импортироваться по имени модуля)
+    profile: str = PROFILE_IO
+    # Таймаут в секундах и лимит одновременных запусков (0 — без лимита)
+    timeout: Optional[float] = None
+    max_concurrency: int = 0
 
 class SecureSkillRegistry:
     def __init__(self):
         self.skills = {}
+        self._load_lock = threading.Lock()
+        self._executor = None
         
     def register(self, skill: Skill):
         self.skills[skill.name] = skill
+
+    def register_lazy(self, name: str, entry_point: str, desc: str = "", capabilities: list = None, **limits):
+        """Регистрирует лёгкую заглушку навыка без импорта его модуля"""
+        if name in self.skills:
+            return
+        self.register(Skill(
+            name=name,
+            description=desc,
+            entry_point=entry_point,
+            required_capabilities=capabilities or [],
+            **limits
+        ))
+
+    def discover_entry_points(self, group: str = SKILL_ENTRY_POINT_GROUP) -> int:
+        """Находит навыки, объявленные через Python entry points"""
+        from importlib.metadata import entry_points
+
+        try:
+            eps = entry_points(group=group)
+        except TypeError:  # Python < 3.10
+            eps = entry_points().get(group, [])
+
+        count = 0
+        for ep in eps:
+            self.register_lazy(ep.name, ep.value)
+            count += 1
+        logger.debug(f"Discovered {count} skills from entry points '{group}'")
+        return count
+
+    def discover_manifests(self, directory: str = "manifests") -> int:
+        """Находит навыки в манифестах, содержащих поле entry_point"""
+        if not os.path.isdir(directory):
+            return 0
+
+        count = 0
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(directory, filename), "r") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping skill manifest {filename}: {e}")
+                continue
+
+            entry_point = manifest.get("entry_point")
+            if not entry_point:
+                continue
+            limits = {k: manifest[k] for k in ("profile", "timeout", "max_concurrency") if k in manifest}
+            self.register_lazy(
+                manifest.get("skill_name", filename[:-len(".json")]),
+                entry_point,
+                desc=manifest.get("description", ""),
+                capabilities=manifest.get("capabilities", []),
+                **limits
+            )
+            count += 1
+        logger.debug(f"Discovered {count} skills in {directory}")
+        return count
+
+    def _resolve(self, skill: Skill) -> Callable[[str], str]:
+        if skill.function is not None:
+            return skill.function
+
+        with self._load_lock:
+            if skill.function is None:
+                module_name, _, attr = skill.entry_point.partition(":")
+                logger.info(f"Loading skill {skill.name} from {skill.entry_point}")
+                target = importlib.import_module(module_name)
+                for part in attr.split("."):
+                    if part:
+                        target = getattr(target, part)
+                skill.function = target
+                if not skill.description:
+                    skill.description = (target.__doc__ or "").strip()
+        return skill.function
         
     def execute(self, skill_name: str, input_data: str) -> str:
         skill = self.skills.get(skill_name)
@@ -24,22 +127,82 @@ class SecureSkillRegistry:
             return f"Error: Skill '{skill_name}' not found"
             
         # Check capabilities
-        if not all(cap_reg.check_capability(cap) for cap in skill.required_capabilities):
+        if not cap_reg.authorize(skill.required_capabilities):
             return "Permission denied: Missing capabilities"
-            
-        return skill.function(input_data)
+
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check(f"skill '{skill_name}'")
+
+        try:
+            function = self._resolve(skill)
+        except (ImportError, AttributeError) as e:
+            return f"Error: Skill '{skill_name}' failed to load: {e}"
+
+        if deadline is None or deadline.remaining() is None:
+            return function(input_data)
+
+        # У миссии есть дедлайн: навык выполняется в пуле, а вызывающий ждёт
+        # не дольше остатка бюджета (таймаут навыка урезается так же)
+        future = self.submit(skill_name, input_data)
+        try:
+            return future.result(timeout=deadline.remaining())
+        except SkillTimeoutError:
+            raise
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Mission deadline exceeded while running skill '{skill_name}'")
+
+    def submit(self, skill_name: str, input_data: str) -> Future:
+        """
+        Асинхронное выполнение навыка согласно его профилю.
+        Возвращает Future; ошибки проверки возвращаются как готовый результат,
+        так же как в execute().
+        """
+        skill = self.skills.get(skill_name)
+        error = None
+        if not skill:
+            error = f"Error: Skill '{skill_name}' not found"
+        elif not cap_reg.authorize(skill.required_capabilities):
+            error = "Permission denied: Missing capabilities"
+        else:
+            try:
+                function = self._resolve(skill)
+            except (ImportError, AttributeError) as e:
+                error = f"Error: Skill '{skill_name}' failed to load: {e}"
+
+        if error is not None:
+            future = Future()
+            future.set_result(error)
+            return future
+
+        if self._executor is None:
+            with self._load_lock:
+                if self._executor is None:
+                    self._executor = SkillExecutor()
+        return self._executor.submit(skill, function, input_data)
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
 
 # Initialize registry
 registry = SecureSkillRegistry()
+registry.discover_entry_points()
 
 # Skill decorator with capability requirements
-def skill_decorator(name: str, desc: str, capabilities: list):
+def skill_decorator(name: str, desc: str, capabilities: list, profile: str = PROFILE_IO,
+                    timeout: float = None, max_concurrency: int = 0):
     def decorator(func):
         registry.register(Skill(
             name=name,
             description=desc,
             function=func,
-            required_capabilities=capabilities
+            required_capabilities=capabilities,
+            profile=profile,
+            timeout=timeout,
+            max_concurrency=max_concurrency
         ))
         return func
     return decorator
@@ -79,7 +242,10 @@ def default_skill(query: str) -> str:
 @skill_decorator(
     name="SimpleAnalysis",
     desc="Advanced data analysis with statistics",
-    capabilities=[]
+    capabilities=[],
+    profile=PROFILE_CPU,
+    timeout=60,
+    max_concurrency=4
 )
 def analyze_file_content(data: str) -> str:
     """Анализирует содержимое файла и возвращает статистику"""
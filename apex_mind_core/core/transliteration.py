@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+
+logger = logging.getLogger("Transliteration")
+
+# Известные имена: если фраза встречается в запросе, он целиком заменяется
+NAME_CORRECTIONS = {
+    "илон маск": "Elon Musk",
+    "битокин": "Bitcoin",
+    "кубик рубика": "Rubik's Cube"
+}
+
+# Пословные замены, применяемые до транслитерации
+WORD_TRANSLATIONS = {
+    'илон': 'elon', 'маск': 'musk',
+    'битокин': 'bitcoin', 'биткоин': 'bitcoin',
+    'рубик': 'rubik', 'кубик': 'cube'
+}
+
+RU_EN_MAP = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya'
+}
+
+# Таблица для str.translate: буквы плюс разделители, превращаемые в '_'
+_TRANSLIT_TABLE = str.maketrans({**RU_EN_MAP, ' ': '_', '-': '_'})
+
+_word_pattern = None
+
+
+def _compile_word_pattern():
+    global _word_pattern
+    # Длинные слова первыми, чтобы альтернатива не срабатывала на префиксе
+    words = sorted(WORD_TRANSLATIONS, key=len, reverse=True)
+    _word_pattern = re.compile(
+        r'\b(?:' + '|'.join(map(re.escape, words)) + r')\b', re.IGNORECASE
+    ) if words else None
+
+
+def load_corrections(path: str):
+    """
+    Дополняет словари из JSON-файла вида
+    {"names": {"фраза": "Name"}, "words": {"слово": "word"}}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    NAME_CORRECTIONS.update({k.lower(): v for k, v in data.get("names", {}).items()})
+    WORD_TRANSLATIONS.update({k.lower(): v for k, v in data.get("words", {}).items()})
+    _compile_word_pattern()
+    _normalize_lowered.cache_clear()
+    logger.info(f"Loaded transliteration corrections from {path}")
+
+
+def transliterate_ru_en(text: str) -> str:
+    return text.lower().translate(_TRANSLIT_TABLE)
+
+
+def enhanced_transliteration(text: str) -> str:
+    if _word_pattern is not None:
+        text = _word_pattern.sub(lambda m: WORD_TRANSLATIONS[m.group(0).lower()], text)
+    return transliterate_ru_en(text)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_lowered(lowered: str) -> str:
+    for ru, en in NAME_CORRECTIONS.items():
+        if ru in lowered:
+            return en
+    return enhanced_transliteration(lowered)
+
+
+def normalize_en_query(text: str) -> str:
+    """Приводит русский запрос к английскому заголовку Википедии (с кэшем)"""
+    # Результат зависит только от текста в нижнем регистре — по нему и кэшируем
+    return _normalize_lowered(text.lower())
+
+
+_compile_word_pattern()
+if os.getenv("APEX_CORRECTIONS_FILE"):
+    load_corrections(os.environ["APEX_CORRECTIONS_FILE"])
@@ -1,21 +1,35 @@
 from curses import raw
 import os
-import json
 import logging
 import sys
+import contextvars
+import threading
+import time
+import fnmatch
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from pathlib import Path
 
 from .capability_manifest import CapabilityManifest
+from .rate_limiter import rate_limiter
+from .http_cache import http_cache
+from .file_writer import shared_coalescer, atomic_write, ensure_parent_dir
+from .read_cache import FileReadCache, shared_read_cache
+from . import cpu_compute
+from .sensor_stream import SensorStream
+from .camera_capture import CameraStream, SimulatedFrameSource
+from .deadline import check_deadline, call_timeout
+from . import json_codec
+from .dns_cache import enabled as dns_cache_enabled, install as install_dns_cache
+from .http_session import shared_session
 from apex_mind_core.common.types import HardwareOpType
 
 
 
 try:
     from wasi_security_layer.wasi_security_layer import (
-        create_wasi_context,
-        HardwareOp as _RustHardwareOp,
         HardwareOpType as _RustHardwareOpType,
         safe_gpu_compute as _orig_safe_gpu_compute,
         read_sensor,
@@ -25,8 +39,6 @@ try:
     )
 except ImportError:
     from wasi_security_layer import (
-        create_wasi_context,
-        HardwareOp as _RustHardwareOp,
         HardwareOpType as _RustHardwareOpType,
         safe_gpu_compute as _orig_safe_gpu_compute,
         read_sensor,
@@ -51,42 +63,72 @@ from apex_mind_core.common.types import HardwareOpType
 print([v.name for v in HardwareOpType])
 
 class HardwareOpWrapper:
-    def __init__(self, rust_op, op_name):
-        self._rust_op = rust_op
-        self._op_name = op_name
-        # Добавляем словарь для хранения дополнительных атрибутов
-        self.extra_attributes = {}
-
-    def __getattr__(self, name):
-        # Сначала проверяем дополнительные атрибуты
-        if name in self.extra_attributes:
-            return self.extra_attributes[name]
-        # Затем пробуем получить атрибут из Rust-объекта
-        return getattr(self._rust_op, name)
-
-    def __setattr__(self, name, value):
-        if name in ['_rust_op', '_op_name', 'extra_attributes']:
-            super().__setattr__(name, value)
-        else:
-            # Сохраняем в дополнительные атрибуты
-            self.extra_attributes[name] = value
+    """
+    Компактное представление аппаратной операции.
+    Все поля хранятся в __slots__ без словаря атрибутов. Операция целиком
+    остаётся на стороне Python: Rust-функции проверки получают отдельные
+    значения (путь, манифест), а не HardwareOp.
+    """
+    __slots__ = (
+        "op_type", "_op_name",
+        # поля, общие с Rust HardwareOp
+        "path", "url", "method", "data", "shader_code", "sensor_type",
+        # поля, известные только Python-мосту
+        "headers", "mode", "atomic", "buffered", "kernel",
+        "pattern", "recursive", "read", "max_workers",
+    )
 
-def HardwareOp(op_type, *args, **kwargs):
+    def __init__(self, op_type: HardwareOpType, op_name: str):
+        self.op_type = op_type
+        self._op_name = op_name
+        self.path = None
+        self.url = None
+        self.method = "GET"
+        self.data = None
+        self.shader_code = None
+        self.sensor_type = None
+        self.headers = None
+        self.mode = None
+        self.atomic = False
+        self.buffered = False
+        self.kernel = None
+        self.pattern = None
+        self.recursive = True
+        self.read = False
+        self.max_workers = None
+
+    def __repr__(self):
+        target = self.path or self.url or self.sensor_type or ""
+        return f"HardwareOp({self._op_name}, {target!r})"
+
+def HardwareOp(op_type):
     if isinstance(op_type, HardwareOpType):
-        name = op_type.name
-        rust_variant = getattr(_RustHardwareOpType, name)
-    else:
-        name = getattr(op_type, "name", str(op_type)).split('.')[-1]
-        rust_variant = op_type
+        return HardwareOpWrapper(op_type, op_type.name)
+
+    # Вариант Rust-перечисления: приводим к Python HardwareOpType по имени
+    name = getattr(op_type, "name", str(op_type)).split('.')[-1]
+    return HardwareOpWrapper(HardwareOpType[name], name)
+
+# None — адаптер ещё не проверялся; False — адаптера нет, GPU больше не опрашиваем
+_gpu_adapter_available = None
 
-    rust_obj = _RustHardwareOp(rust_variant, *args, **kwargs)
-    return HardwareOpWrapper(rust_obj, name)
+def gpu_adapter_available() -> bool:
+    return _gpu_adapter_available is not False
 
 def safe_gpu_compute(shader_code: str, data: bytes) -> bytes:
-    try:
-        return _orig_safe_gpu_compute(shader_code, data)
-    except RuntimeError:
+    global _gpu_adapter_available
+    if _gpu_adapter_available is False:
         raise ImportError("GPU adapter unavailable")
+    try:
+        result = _orig_safe_gpu_compute(shader_code, data)
+        _gpu_adapter_available = True
+        return result
+    except RuntimeError as e:
+        if "adapter" in str(e).lower():
+            _gpu_adapter_available = False
+            raise ImportError("GPU adapter unavailable")
+        # Ошибка шейдера или буфера — не повод считать GPU отсутствующим
+        raise RuntimeError(f"GPU compute failed: {e}") from e
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -102,6 +144,15 @@ class FileOperations:
     def __init__(self, manifest: CapabilityManifest):
         self.manifest = manifest
         self.logger = logging.getLogger("FileOperations")
+        # fsync после каждой записи либо один раз на сброс буфера дозаписей
+        self.fsync = getattr(manifest, "fsync", False)
+        self.write_coalescer = shared_coalescer(self.fsync)
+        # Пути, дозаписи в которые этот экземпляр положил в общий буфер
+        self._buffered_paths = set()
+        self._buffered_lock = threading.Lock()
+        self.read_cache = None
+        if getattr(manifest, "read_cache", False):
+            self.read_cache = shared_read_cache(getattr(manifest, "read_cache_bytes", None))
 
     def _check_permission(self, op: str, path: str):
         if not self.manifest.validate(op, path):
@@ -134,28 +185,183 @@ class FileOperations:
         except Exception:
             return False
 
+    def _settle_pending(self, path: str):
+        # Буферизованные дозаписи попадают на диск до любой другой операции с файлом,
+        # иначе чтение их не увидит, а перезапись окажется перед ними
+        self.write_coalescer.flush([path])
+
     def read_file(self, path: str) -> bytes:
         """Чтение файла с проверкой разрешений"""
         self._check_permission("read", path)
+        self._settle_pending(path)
         if not os.path.exists(path):
             raise FileNotFoundError(f"Path does not exist: {path}")
 
+        if self.read_cache is not None:
+            return self._read_cached(path)
+
         self.logger.info(f"Reading file: {path}")
         with open(path, "rb") as f:
             return f.read()
 
-    def write_file(self, path: str, data: bytes) -> int:
-        """Запись в файл с проверкой разрешений"""
+    def _read_cached(self, path: str) -> bytes:
+        # Один stat вместо open/read/close, если файл не менялся
+        key = os.path.abspath(path)
+        data = self.read_cache.get(key, FileReadCache.stamp(os.stat(path)))
+        if data is not None:
+            self.logger.debug(f"Read cache hit: {path}")
+            return data
+
+        self.logger.info(f"Reading file: {path}")
+        with open(path, "rb") as f:
+            # Отпечаток берём с открытого дескриптора, чтобы он соответствовал прочитанному
+            stamp = FileReadCache.stamp(os.fstat(f.fileno()))
+            data = f.read()
+        self.read_cache.put(key, stamp, data)
+        return data
+
+    def iter_file(self, path: str, chunk_size: int = 1024 * 1024):
+        """Потоковое чтение файла чанками, без загрузки целиком в память"""
+        if not self._check_permission("read", path):
+            raise PermissionError(f"Read access to {path} denied")
+        self._settle_pending(path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Path does not exist: {path}")
+
+        self.logger.info(f"Streaming file: {path}")
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def write_file(self, path: str, data: bytes, mode: str = "overwrite",
+                   atomic: bool = False, buffered: bool = False) -> int:
+        """
+        Запись в файл с проверкой разрешений.
+        mode: "overwrite" или "append"; atomic — через временный файл и rename;
+        buffered — дозапись копится и сбрасывается пакетно (только для append).
+        """
         self._check_permission("write", path)
+        if mode not in ("overwrite", "append"):
+            raise ValueError(f"Unsupported write mode: {mode}")
+        if self.read_cache is not None:
+            self.read_cache.invalidate(os.path.abspath(path))
+
+        if buffered and mode == "append":
+            with self._buffered_lock:
+                self._buffered_paths.add(os.path.abspath(path))
+            return self.write_coalescer.append(path, data)
+
+        self._settle_pending(path)
 
         self.logger.info(f"Writing to file: {path}")
+        if atomic and mode == "overwrite":
+            return atomic_write(path, data, fsync=self.fsync)
+
+        ensure_parent_dir(path)
+        with open(path, "ab" if mode == "append" else "wb") as f:
+            written = f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+            return written
+
+    def flush(self, paths=None):
+        """
+        Сбрасывает на диск дозаписи, буферизованные этим экземпляром
+        (или только те из них, что относятся к paths).
+        Буферы других навыков в общем coalescer не трогаются.
+        """
+        with self._buffered_lock:
+            if paths is None:
+                paths, self._buffered_paths = self._buffered_paths, set()
+            else:
+                paths = {os.path.abspath(p) for p in paths} & self._buffered_paths
+                self._buffered_paths -= paths
+        if not paths:
+            return
         try:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-        except OSError as e:
-            raise PermissionError(f"Cannot create directory for {path}: {e}")
+            self.write_coalescer.flush(paths)
+        except OSError:
+            # Несброшенные данные остались в буфере — следующий flush() повторит запись
+            with self._buffered_lock:
+                self._buffered_paths |= paths
+            raise
 
-        with open(path, "wb") as f:
-            return f.write(data)
+    def scan_directory(self, root: str, pattern: str = "*", recursive: bool = True,
+                       read: bool = False, max_workers: int = 8):
+        """
+        Потоковый обход каталога через os.scandir.
+        Разрешение проверяется один раз на каталог, а не на каждый файл;
+        при read=True содержимое файлов читается в пуле потоков.
+        Возвращает итератор словарей {"path", "size"[, "data"]}.
+        """
+        # Корень тоже может быть симлинком: разрешение проверяется и по реальному пути
+        if not (self._check_permission("read", root)
+                and self._check_permission("read", os.path.realpath(root))):
+            raise PermissionError(f"Read access to {root} denied")
+        if not os.path.isdir(root):
+            raise NotADirectoryError(f"Not a directory: {root}")
+
+        self.logger.info(f"Scanning directory: {root} ({pattern})")
+        entries = self._iter_matching(root, pattern, recursive)
+        if not read:
+            return ({"path": path, "size": size} for path, size in entries)
+        return self._read_entries(entries, max_workers)
+
+    def _iter_matching(self, root: str, pattern: str, recursive: bool):
+        # Шаблон с "/" сопоставляется с относительным путём, иначе с именем файла
+        match_relative = "/" in pattern
+        root = os.path.abspath(root)
+        stack = [root]
+        # (st_dev, st_ino) пройденных каталогов: симлинк на предка не зацикливает обход
+        visited = set()
+        while stack:
+            check_deadline(f"scanning {root}")
+            directory = stack.pop()
+            # Каталог, в который ведёт симлинк, проверяется по реальному пути
+            if directory != root and not self._check_permission("read", os.path.realpath(directory)):
+                self.logger.warning(f"Skipping directory outside manifest: {directory}")
+                continue
+            try:
+                st = os.stat(directory)
+                key = (st.st_dev, st.st_ino)
+                if key in visited:
+                    continue
+                visited.add(key)
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir():
+                            if recursive:
+                                stack.append(entry.path)
+                            continue
+                        if not entry.is_file():
+                            continue
+                        if entry.is_symlink() and not self._check_permission("read", os.path.realpath(entry.path)):
+                            continue
+                        name = os.path.relpath(entry.path, root).replace("\\", "/") if match_relative else entry.name
+                        if fnmatch.fnmatch(name, pattern):
+                            yield entry.path, entry.stat().st_size
+            except OSError as e:
+                self.logger.warning(f"Cannot scan {directory}: {e}")
+
+    def _read_entries(self, entries, max_workers: int):
+        def _read(path):
+            self._settle_pending(path)
+            with open(path, "rb") as f:
+                return f.read()
+
+        # Ограниченное окно задач: файлы читаются параллельно, но выдаются по порядку
+        window = max(1, max_workers) * 2
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            pending = deque()
+            for path, size in entries:
+                pending.append((path, size, pool.submit(_read, path)))
+                if len(pending) >= window:
+                    path_, size_, future = pending.popleft()
+                    yield {"path": path_, "size": size_, "data": future.result()}
+            while pending:
+                path_, size_, future = pending.popleft()
+                yield {"path": path_, "size": size_, "data": future.result()}
 
     def path_exists(self, path: str) -> bool:
         """Проверка существования пути с учётом прав чтения"""
@@ -166,14 +372,25 @@ class FileOperations:
         return os.path.exists(path)
 
 
+class ResponseTooLargeError(ValueError):
+    """Тело ответа превышает лимит max_response_bytes из манифеста"""
+
+
 class HTTPExecutor:
     """Модуль для выполнения HTTP запросов"""
     ALLOWED_METHODS = {"GET", "POST"}
+    CHUNK_SIZE = 64 * 1024
+    # Тайм-аут запроса без дедлайна миссии; с дедлайном урезается до остатка
+    DEFAULT_TIMEOUT = 10.0
 
     def __init__(self, manifest: CapabilityManifest):
         self.manifest = manifest
         self.logger = logging.getLogger("HTTPExecutor")
-        self.session = requests.Session()
+        # Пул соединений общий для всех HTTPExecutor процесса
+        self.session = shared_session()
+        if getattr(manifest, "dns_cache", True):
+            install_dns_cache()
+        rate_limiter.configure(getattr(manifest, "rate_limits", {}))
 
     def execute_request(self, method: str, url: str, data=None, headers=None) -> dict:
         """Выполнение HTTP запроса с проверкой разрешений"""
@@ -188,31 +405,108 @@ class HTTPExecutor:
         if not parsed.scheme or not parsed.netloc:
             raise ValueError(f"Invalid URL: {url}")
 
+        domain = parsed.netloc
         # Дополнительно: проверка разрешённого домена (если поддерживается manifest)
         if hasattr(self.manifest, "allowed_domains"):
-            domain = parsed.netloc
             if domain not in self.manifest.allowed_domains:
                 raise PermissionError(f"Domain not allowed: {domain}")
 
+        cache_key = cached = None
+        request_headers = headers
+        if method == "GET" and getattr(self.manifest, "http_cache", False):
+            cache_key = http_cache.key(url, headers)
+            cached = http_cache.get(cache_key, headers)
+            if cached is not None:
+                if cached.is_fresh(time.monotonic()):
+                    self.logger.debug(f"HTTP cache hit: {url}")
+                    return self._cached_result(cached)
+                # Устаревшая запись — перепроверяем её условным запросом
+                headers = {**(headers or {}), **http_cache.conditional_headers(cached)}
+
+        # Выдерживаем темп запросов к домену, чтобы не получать 429,
+        # но не ждём токен дольше, чем осталось у миссии
+        rate_limiter.acquire(domain, max_wait=call_timeout(None, f"request to {domain}"))
         self.logger.info(f"Executing {method} request to: {url}")
 
         try:
-            response = self.session.request(
-                method,
-                url,
-                data=data,
-                headers=headers or {},
-                timeout=10
-            )
+            # Общая сессия уже может идти через кэш DNS: соблюдаем флаг манифеста
+            with dns_cache_enabled(getattr(self.manifest, "dns_cache", True)):
+                response = self.session.request(
+                    method,
+                    url,
+                    data=data,
+                    headers=headers or {},
+                    timeout=call_timeout(self.DEFAULT_TIMEOUT, f"request to {domain}"),
+                    stream=True
+                )
+        except requests.RequestException as e:
+            self.logger.error(f"HTTP request failed: {e}")
+            raise
+
+        try:
+            if response.status_code == 429:
+                rate_limiter.penalize(domain, self._retry_after(response))
+            if response.status_code == 304 and cached is not None:
+                self.logger.debug(f"HTTP cache revalidated: {url}")
+                http_cache.refresh(cache_key, response.headers)
+                return self._cached_result(cached)
+
+            # Сырые байты тела: декодируются один раз на стороне потребителя
+            body = self._read_body(response, url)
+            if cache_key is not None and response.status_code == 200:
+                http_cache.store(cache_key, body, response.headers, response.url, request_headers)
             return {
                 "status_code": response.status_code,
-                "content": response.text,
-                "headers": dict(response.headers),
+                "content": body,
+                "headers": response.headers,
                 "url": response.url
             }
         except requests.RequestException as e:
             self.logger.error(f"HTTP request failed: {e}")
             raise
+        finally:
+            response.close()
+
+    @staticmethod
+    def _cached_result(entry) -> dict:
+        return {
+            "status_code": 200,
+            "content": entry.body,
+            "headers": entry.headers,
+            "url": entry.url
+        }
+
+    def _read_body(self, response, url: str) -> bytes:
+        """Потоковое чтение тела с прерыванием при превышении лимита"""
+        limit = getattr(self.manifest, "max_response_bytes", None)
+
+        declared = response.headers.get("Content-Length")
+        if limit and declared and declared.isdigit() and int(declared) > limit:
+            raise ResponseTooLargeError(
+                f"Response from {url} declares {declared} bytes, limit is {limit}"
+            )
+
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+            # Тайм-аут requests ограничивает каждое чтение, а не всё тело
+            check_deadline(f"reading response from {url}")
+            received += len(chunk)
+            if limit and received > limit:
+                raise ResponseTooLargeError(
+                    f"Response from {url} exceeded {limit} bytes, aborted"
+                )
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _retry_after(response, default: float = 1.0) -> float:
+        value = response.headers.get("Retry-After")
+        try:
+            return max(0.0, float(value)) if value else default
+        except ValueError:
+            # Retry-After в формате HTTP-даты — используем значение по умолчанию
+            return default
 
 
 class WASIGuard:
@@ -228,26 +522,27 @@ class WASIGuard:
                 "sensors": False,
                 "camera": False
             }
-            with open(manifest_path, "w") as f:
-                json.dump(default, f)
+            json_codec.dump_file(default, manifest_path, indent=False)
 
-        with open(manifest_path, "r") as f:
-            man = json.load(f)
+        man = json_codec.load_file(manifest_path)
 
         # Normalize paths
+        normalized = False
         for op in ("read", "write", "delete"):
-            man["filesystem"][op] = [
-                p.replace("\\", "/")
-                for p in man["filesystem"].get(op, [])
-            ]
-        with open(manifest_path, "w") as f:
-            json.dump(man, f, indent=2)
+            paths = man["filesystem"].get(op, [])
+            fixed = [p.replace("\\", "/") for p in paths]
+            normalized |= fixed != paths
+            man["filesystem"][op] = fixed
+        # Перезаписываем манифест только если пути изменились: иначе каждое
+        # создание WASIGuard меняло бы mtime и сбрасывало кэши SecurityEnforcer
+        if normalized:
+            json_codec.dump_file(man, manifest_path)
 
         self._manifest_dict = man
         self.manifest = CapabilityManifest(man)
         self.file_ops = FileOperations(self.manifest)
         self.http_executor = HTTPExecutor(self.manifest)
-        logger.debug(f"Loaded manifest: {json.dumps(man)}")
+        logger.debug(f"Loaded manifest: {manifest_path}")
 
         if self.is_arm_environment():
             self.apply_arm_optimizations()
@@ -267,22 +562,70 @@ class WASIGuard:
         self.manifest.gpu = False
         self._manifest_dict["gpu"] = False
 
+    def validate_op(self, operation: HardwareOp):
+        """Предварительная проверка операции по манифесту без её выполнения"""
+        op_name = operation._op_name
+
+        if op_name == "FileRead":
+            if not self.file_ops._check_permission("read", operation.path):
+                raise PermissionError(f"Read access to {operation.path} denied")
+        elif op_name == "FileWrite":
+            if not self.file_ops._check_permission("write", operation.path):
+                raise PermissionError(f"Write access to {operation.path} denied")
+        elif op_name == "DirectoryScan":
+            if not self.file_ops._check_permission("read", operation.path):
+                raise PermissionError(f"Read access to {operation.path} denied")
+        elif op_name == "NetworkRequest":
+            if not self.manifest.network:
+                raise PermissionError("Network access not allowed")
+            method = (getattr(operation, "method", "GET") or "GET").upper()
+            if method not in HTTPExecutor.ALLOWED_METHODS:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+        elif op_name == "GpuCompute":
+            if not self.manifest.gpu:
+                raise PermissionError("GPU access not allowed")
+            kernel = operation.kernel
+            if not kernel and operation.shader_code is None:
+                raise ValueError("GpuCompute requires shader_code or kernel")
+            if kernel:
+                name = kernel if isinstance(kernel, str) else kernel.get("name")
+                if name not in cpu_compute.SUPPORTED_KERNELS:
+                    raise ValueError(f"Unsupported CPU kernel: {name}")
+        elif op_name == "SensorRead":
+            if not self.manifest.sensors:
+                raise PermissionError("Sensor access not allowed")
+        elif op_name == "CameraCapture":
+            if not self.manifest.camera:
+                raise PermissionError("Camera access not allowed")
+        else:
+            raise ValueError(f"Unsupported operation type: {op_name}")
+
     def __enter__(self):
-        fs = self._manifest_dict.get("filesystem", {})
-        read_dirs = [(p, p) for p in fs.get("read", [])]
-        write_dirs = [(p, p) for p in fs.get("write", [])]
-        logger.debug(f"Creating WASI context with read={read_dirs}, write={write_dirs}")
-        create_wasi_context(read_dirs + write_dirs)
         return self
 
     def execute_op(self, operation: HardwareOp) -> any:
         op_name = operation._op_name
         logger.debug(f"Executing operation: {op_name}")
+        check_deadline(op_name)
 
         if op_name == "FileRead":
             return self.file_ops.read_file(operation.path)
         if op_name == "FileWrite":
-            return self.file_ops.write_file(operation.path, operation.data)
+            return self.file_ops.write_file(
+                operation.path,
+                operation.data,
+                mode=getattr(operation, "mode", "overwrite") or "overwrite",
+                atomic=bool(getattr(operation, "atomic", False)),
+                buffered=bool(getattr(operation, "buffered", False)),
+            )
+        if op_name == "DirectoryScan":
+            return self.file_ops.scan_directory(
+                operation.path,
+                pattern=getattr(operation, "pattern", "*") or "*",
+                recursive=bool(getattr(operation, "recursive", True)),
+                read=bool(getattr(operation, "read", False)),
+                max_workers=getattr(operation, "max_workers", 8) or 8,
+            )
         if op_name == "NetworkRequest":
             # Получаем метод, данные и заголовки
             method = getattr(operation, "method", "GET") or "GET"
@@ -295,14 +638,27 @@ class WASIGuard:
                 data=data,
                 headers=headers,
             )
-            return result["content"].encode()
+            return result["content"]
         if op_name == "GpuCompute":
             if not self.manifest.gpu:
                 raise PermissionError("GPU access not allowed")
-            try:
-                return safe_gpu_compute(operation.shader_code, operation.data)
-            except ImportError:
-                return operation.data
+            kernel = operation.kernel
+            shader_code = operation.shader_code
+            if shader_code is None:
+                # Только описание ядра: шейдера для GPU нет, сразу CPU-бэкенд
+                if not kernel:
+                    raise ValueError("GpuCompute requires shader_code or kernel")
+            elif not kernel or gpu_adapter_available():
+                try:
+                    return safe_gpu_compute(shader_code, operation.data)
+                except ImportError:
+                    if not kernel:
+                        return operation.data
+            # GPU нет — выполняем описанное ядро векторизованно на CPU
+            if cpu_compute.available():
+                return cpu_compute.run_kernel(kernel, operation.data)
+            logger.warning("CPU compute backend requires NumPy, returning input unchanged")
+            return operation.data
         if op_name == "SensorRead":
             if not self.manifest.sensors:
                 raise PermissionError("Sensor access not allowed")
@@ -318,8 +674,73 @@ class WASIGuard:
         if exc_type:
             logger.error(f"WASIGuard exit with error: {exc_val}")
 
+    def open_sensor_stream(self, sensor_type: str, rate_hz: float, capacity: int = 4096) -> SensorStream:
+        """Поток выборки датчика: разрешение проверяется один раз, а не на каждый отсчёт"""
+        if not self.manifest.sensors:
+            raise PermissionError("Sensor access not allowed")
+        # Пробное чтение отсекает неподдерживаемый тип датчика до запуска потока
+        read_sensor(sensor_type)
+        return SensorStream(read_sensor, sensor_type, rate_hz, capacity)
+
+    def open_camera_stream(self, width: int = 640, height: int = 480, channels: int = 3,
+                           fps: float = 30.0, buffers: int = 8, source=None) -> CameraStream:
+        """Захват кадров в пул заранее выделенных буферов"""
+        if not self.manifest.camera:
+            raise PermissionError("Camera access not allowed")
+        # Реальной камеры пока нет — используем симулированный источник
+        source = source or SimulatedFrameSource(width, height, channels)
+        return CameraStream(source, fps=fps, buffers=buffers)
+
+    def close(self):
+        """Сбрасывает буферизованные этим экземпляром дозаписи"""
+        self.file_ops.flush()
+
+
+class WasiResponse:
+    """Response-подобная обёртка над телом сетевого ответа"""
+    __slots__ = ("status_code", "content", "_text")
+
+    def __init__(self, data: bytes):
+        # HTTP‑код, можно вынести в manifest, но по умолчанию 200
+        self.status_code = 200
+        self.content = data
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        # декодируем тело в строку один раз, при первом обращении
+        if self._text is None:
+            self._text = self.content.decode('utf-8', errors='replace')
+        return self._text
+
+    def json(self):
+        # разбор прямо из байт, без промежуточной строки
+        return json_codec.loads(self.content)
+
+
+class BatchResult:
+    """Результат одной операции из пакета: значение либо ошибка"""
+    def __init__(self, value=None, error: Exception = None):
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"BatchResult(error={self.error!r})"
+        return f"BatchResult(value={self.value!r})"
+
 
 class ReptilianEngine:
+    # Операции, которые можно безопасно выполнять параллельно в пуле потоков
+    PARALLEL_OPS = {"FileRead", "FileWrite", "NetworkRequest"}
+    # Операции над путями: всё, что касается одного пути, выполняется по порядку
+    PATH_OPS = {"FileRead", "FileWrite", "DirectoryScan"}
+    DEFAULT_BATCH_WORKERS = 8
+
     def __init__(self, skill_name: str):
         self.skill_name = skill_name
         # Используем переданное имя навыка для манифеста
@@ -336,29 +757,149 @@ class ReptilianEngine:
                 "camera": False
             }
             os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
-            with open(self.manifest_path, "w") as f:
-                json.dump(default_manifest, f, indent=2)
+            json_codec.dump_file(default_manifest, self.manifest_path)
         
         logger.info(f"Initialized ReptilianEngine for {skill_name}")
         self._wasi_guard = WASIGuard(self.manifest_path)
         self.file_ops = self._wasi_guard.file_ops
         self.http_executor = self._wasi_guard.http_executor
 
+    def _wrap_result(self, operation: HardwareOp, raw):
+        # если это сетевой запрос — оборачиваем в «Response»-подобный объект
+        if operation._op_name == "NetworkRequest":
+            return WasiResponse(raw)
+        # для всех остальных операций возвращаем результат «как есть»
+        return raw
+
     def execute_hardware_op(self, operation: HardwareOp):
         # внутри guard возвращаются сырые bytes для NetworkRequest
         with self._wasi_guard as guard:
             raw = guard.execute_op(operation)
+        return self._wrap_result(operation, raw)
 
-        # если это сетевой запрос — оборачиваем в «Response»-подобный объект
-        if operation.op_type == HardwareOpType.NetworkRequest:
-            # простая «импровизированная» обёртка
-            class WasiResponse:
-                def __init__(self, data: bytes):
-                    # HTTP‑код, можно вынести в manifest, но по умолчанию 200
-                    self.status_code = 200
-                    # декодируем тело в строку
-                    self.text = data.decode('utf-8', errors='replace')
-            return WasiResponse(raw)
+    def sensor_stream(self, sensor_type: str, rate_hz: float, capacity: int = 4096) -> SensorStream:
+        """Высокочастотная выборка датчика в кольцевой буфер (запускается через start())"""
+        return self._wasi_guard.open_sensor_stream(sensor_type, rate_hz, capacity)
 
-        # для всех остальных операций возвращаем результат «как есть»
-        return raw
+    def camera_stream(self, width: int = 640, height: int = 480, channels: int = 3,
+                      fps: float = 30.0, buffers: int = 8, source=None) -> CameraStream:
+        """Поток кадров без выделения памяти на каждый кадр (запускается через start())"""
+        return self._wasi_guard.open_camera_stream(width, height, channels, fps, buffers, source)
+
+    def _execute_in_batch(self, guard: WASIGuard, operation: HardwareOp) -> BatchResult:
+        try:
+            raw = guard.execute_op(operation)
+            if operation._op_name == "DirectoryScan":
+                # Обход выполняется сейчас, а не при чтении результата после пакета
+                raw = list(raw)
+            return BatchResult(value=self._wrap_result(operation, raw))
+        except Exception as e:
+            logger.error(f"Batch operation {operation._op_name} failed: {e}")
+            return BatchResult(error=e)
+
+    def _execute_group(self, guard: WASIGuard, operations: list, indices: list) -> list:
+        results = [self._execute_in_batch(guard, operations[i]) for i in indices]
+
+        # Дозаписи группы сбрасываются сразу, и ошибка записи достаётся их операциям
+        buffered = {}
+        for position, i in enumerate(indices):
+            operation = operations[i]
+            if (operation._op_name == "FileWrite" and operation.buffered
+                    and operation.mode == "append" and results[position].ok):
+                buffered.setdefault(os.path.abspath(operation.path), []).append(position)
+        for path, positions in buffered.items():
+            try:
+                guard.file_ops.flush([path])
+            except OSError as e:
+                for position in positions:
+                    results[position] = BatchResult(error=e)
+        return results
+
+    @staticmethod
+    def _contains(root: str, path: str) -> bool:
+        return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+    def _ordered_groups(self, operations: list, indices: list) -> list:
+        """
+        Делит операции пакета на группы для пула. Операции над одним путём,
+        а для DirectoryScan — над любым путём внутри каталога, попадают в одну
+        группу и выполняются в порядке пакета; разные группы идут параллельно.
+        """
+        parent = {i: i for i in indices}
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        by_path = {}
+        scans = []
+        for i in indices:
+            operation = operations[i]
+            if operation._op_name not in self.PATH_OPS:
+                continue
+            path = os.path.abspath(operation.path)
+            related = [by_path[path]] if path in by_path else []
+            related += [j for root, j in scans if self._contains(root, path)]
+            if operation._op_name == "DirectoryScan":
+                related += [j for other, j in by_path.items() if self._contains(path, other)]
+                related += [j for root, j in scans if self._contains(path, root)]
+                scans.append((path, i))
+            for j in related:
+                parent[find(j)] = find(i)
+            by_path.setdefault(path, i)
+
+        groups = {}
+        for i in indices:
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+
+    def execute_batch(self, operations, max_workers: int = DEFAULT_BATCH_WORKERS) -> list:
+        """
+        Пакетное выполнение операций.
+        Все операции проверяются по манифесту заранее, файловые и сетевые
+        операции выполняются в пуле потоков.
+        Операции над одним путём выполняются последовательно, в порядке пакета;
+        результат DirectoryScan в пакете — список.
+        Возвращает список BatchResult в порядке исходных операций.
+        """
+        operations = list(operations)
+        results = [None] * len(operations)
+
+        runnable = []
+        for index, operation in enumerate(operations):
+            try:
+                self._wasi_guard.validate_op(operation)
+                runnable.append(index)
+            except Exception as e:
+                results[index] = BatchResult(error=e)
+
+        logger.info(
+            f"Executing batch of {len(operations)} ops "
+            f"({len(operations) - len(runnable)} rejected by manifest)"
+        )
+        if not runnable:
+            return results
+
+        pooled_ops = self.PARALLEL_OPS | self.PATH_OPS
+        parallel = [i for i in runnable if operations[i]._op_name in pooled_ops]
+        sequential = [i for i in runnable if operations[i]._op_name not in pooled_ops]
+        # Группа — одна задача пула, иначе порядок операций над путём случаен
+        groups = self._ordered_groups(operations, parallel)
+
+        with self._wasi_guard as guard:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                futures = [
+                    # Дедлайн миссии передаётся в потоки пула вместе с контекстом
+                    (group, pool.submit(contextvars.copy_context().run,
+                                        self._execute_group, guard, operations, group))
+                    for group in groups
+                ]
+                for i in sequential:
+                    results[i] = self._execute_in_batch(guard, operations[i])
+                for group, future in futures:
+                    for i, result in zip(group, future.result()):
+                        results[i] = result
+
+        return results
@@ -0,0 +1,266 @@
+import collections
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+logger = logging.getLogger("MissionWorkerPool")
+
+# Оркестратор, прогретый в родителе до fork: дочерние процессы наследуют
+# уже импортированные модули и разобранные манифесты
+_warm_orchestrator = None
+
+
+def _warm_up(manifest_dir: str = "manifests"):
+    global _warm_orchestrator
+    if _warm_orchestrator is not None:
+        return _warm_orchestrator
+
+    from apex_mind_core.core.orchestrator import Orchestrator
+
+    orchestrator = Orchestrator()
+    if os.path.isdir(manifest_dir):
+        for filename in sorted(os.listdir(manifest_dir)):
+            if filename.endswith(".json"):
+                try:
+                    orchestrator.get_enforcer(filename[:-len(".json")])
+                except Exception as e:
+                    logger.warning(f"Cannot preload manifest {filename}: {e}")
+    _warm_orchestrator = orchestrator
+    return orchestrator
+
+
+def _worker_main(conn, manifest_dir: str, prewarm: bool):
+    orchestrator = _warm_up(manifest_dir)
+    if prewarm:
+        # Соединения не наследуются через fork — каждый воркер открывает свои
+        orchestrator.prewarm_connections()
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            break
+        if item is None:
+            break
+        task_id, mission, timeout = item
+        start = time.perf_counter()
+        try:
+            outcome = ("ok", orchestrator.executor({"mission": mission, "timeout": timeout}))
+        except Exception as e:
+            outcome = ("error", {"context": f"Execution error: {e}"})
+        conn.send((task_id,) + outcome + (time.perf_counter() - start,))
+
+
+class _Worker:
+    __slots__ = ("worker_id", "process", "conn", "task_id")
+
+    def __init__(self, worker_id: int, process, conn):
+        self.worker_id = worker_id
+        self.process = process
+        self.conn = conn
+        self.task_id = None
+
+
+class MissionWorkerPool:
+    """
+    Супервизор пула процессов для Orchestrator.executor.
+    Процессы создаются fork'ом после прогрева импортов и манифестов.
+    Миссии выдаются по одной освободившемуся воркеру, поэтому длинные
+    миссии не задерживают очередь за собой, а супервизор всегда знает,
+    что выполняет каждый процесс: упавший воркер перезапускается,
+    а его миссия возвращается в начало очереди.
+    Перезапуск идёт не fork'ом: к этому моменту у родителя есть потоки,
+    и дочерний процесс мог бы унаследовать захваченные ими блокировки.
+    Замена создаётся через forkserver, запущенный при старте пула
+    (или spawn, где forkserver недоступен).
+    """
+    def __init__(self, workers: int = None, manifest_dir: str = "manifests",
+                 max_task_retries: int = 1, prewarm: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.prewarm = prewarm
+        self.manifest_dir = manifest_dir
+        self.max_task_retries = max_task_retries
+        # fork сохраняет прогретое состояние; где его нет (Windows) — spawn
+        methods = mp.get_all_start_methods()
+        self._ctx = mp.get_context("fork" if "fork" in methods else "spawn")
+        self._restart_ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._workers = {}
+        self._pending = collections.deque()
+        self._futures = {}
+        self._missions = {}
+        self._retries = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup_recv, self._wakeup_send = mp.Pipe(duplex=False)
+        self._stop = False
+        self._thread = None
+        self._metrics = {
+            "submitted": 0, "completed": 0, "failed": 0, "restarts": 0,
+            "busy_seconds": 0.0, "queue_seconds": 0.0, "per_worker": {}
+        }
+        self._queued_at = {}
+
+    def start(self) -> "MissionWorkerPool":
+        if self._restart_ctx.get_start_method() == "forkserver":
+            # Сервер запускается сейчас (fork+exec, без унаследованных блокировок)
+            # и заранее импортирует оркестратор для будущих замен воркеров
+            from multiprocessing import forkserver
+            self._restart_ctx.set_forkserver_preload(["apex_mind_core.core.orchestrator"])
+            forkserver.ensure_running()
+        if self._ctx.get_start_method() == "fork":
+            _warm_up(self.manifest_dir)
+        for worker_id in range(self.workers):
+            self._workers[worker_id] = self._spawn(worker_id, self._ctx)
+        self._thread = threading.Thread(target=self._supervise, name="apex-supervisor", daemon=True)
+        self._thread.start()
+        logger.info(f"Started {self.workers} mission workers ({self._ctx.get_start_method()})")
+        return self
+
+    def _spawn(self, worker_id: int, ctx) -> _Worker:
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.manifest_dir, self.prewarm),
+            name=f"apex-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(worker_id, process, parent_conn)
+
+    def submit(self, mission: str, timeout: float = None) -> Future:
+        """timeout — бюджет миссии в секундах, отсчитываемый с начала выполнения"""
+        future = Future()
+        with self._lock:
+            if self._stop:
+                raise RuntimeError("Worker pool is shut down")
+            task_id = next(self._ids)
+            self._futures[task_id] = future
+            self._missions[task_id] = (mission, timeout)
+            self._queued_at[task_id] = time.perf_counter()
+            self._pending.append(task_id)
+            self._metrics["submitted"] += 1
+        self._wakeup_send.send(None)
+        return future
+
+    def map(self, missions, timeout: float = None, mission_timeout: float = None) -> list:
+        futures = [self.submit(m, mission_timeout) for m in missions]
+        return [f.result(timeout) for f in futures]
+
+    def _supervise(self):
+        while True:
+            with self._lock:
+                if self._stop:
+                    break
+                self._dispatch()
+                waitables = {self._wakeup_recv: None}
+                for worker in self._workers.values():
+                    waitables[worker.conn] = worker
+                    waitables[worker.process.sentinel] = worker
+
+            for ready in wait(list(waitables)):
+                if ready is self._wakeup_recv:
+                    self._wakeup_recv.recv()
+                    continue
+                worker = waitables[ready]
+                if ready is worker.conn:
+                    try:
+                        message = worker.conn.recv()
+                    except (EOFError, OSError):
+                        continue  # обработается по sentinel процесса
+                    self._complete(worker, message)
+                elif not worker.process.is_alive() and self._workers.get(worker.worker_id) is worker:
+                    self._restart(worker)
+
+    def _dispatch(self):
+        for worker in self._workers.values():
+            if not self._pending:
+                return
+            if worker.task_id is None:
+                task_id = self._pending.popleft()
+                worker.task_id = task_id
+                self._metrics["queue_seconds"] += time.perf_counter() - self._queued_at.pop(task_id)
+                worker.conn.send((task_id,) + self._missions[task_id])
+
+    def _complete(self, worker: _Worker, message):
+        task_id, status, result, elapsed = message
+        with self._lock:
+            worker.task_id = None
+            future = self._futures.pop(task_id, None)
+            self._missions.pop(task_id, None)
+            self._retries.pop(task_id, None)
+            per_worker = self._metrics["per_worker"]
+            per_worker[worker.worker_id] = per_worker.get(worker.worker_id, 0) + 1
+            self._metrics["busy_seconds"] += elapsed
+            self._metrics["completed" if status == "ok" else "failed"] += 1
+        if future is not None:
+            future.set_result(result)
+
+    def _restart(self, worker: _Worker):
+        logger.warning(f"Worker {worker.worker_id} exited with code {worker.process.exitcode}, restarting")
+        worker.conn.close()
+        failed = None
+        with self._lock:
+            self._metrics["restarts"] += 1
+            task_id = worker.task_id
+            if task_id is not None and task_id in self._futures:
+                attempts = self._retries.get(task_id, 0)
+                if attempts < self.max_task_retries:
+                    self._retries[task_id] = attempts + 1
+                    self._queued_at[task_id] = time.perf_counter()
+                    self._pending.appendleft(task_id)
+                else:
+                    failed = self._futures.pop(task_id)
+                    self._missions.pop(task_id, None)
+                    self._metrics["failed"] += 1
+            del self._workers[worker.worker_id]
+        # Процесс создаётся вне блокировки пула
+        replacement = self._spawn(worker.worker_id, self._restart_ctx)
+        with self._lock:
+            self._workers[worker.worker_id] = replacement
+        if failed is not None:
+            failed.set_exception(RuntimeError(f"Mission crashed worker {worker.worker_id}"))
+
+    def metrics(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._metrics)
+            snapshot["per_worker"] = dict(self._metrics["per_worker"])
+            snapshot["pending"] = len(self._pending)
+            snapshot["running"] = sum(w.task_id is not None for w in self._workers.values())
+            snapshot["workers_alive"] = sum(w.process.is_alive() for w in self._workers.values())
+        done = snapshot["completed"] + snapshot["failed"]
+        snapshot["mean_seconds"] = snapshot["busy_seconds"] / done if done else 0.0
+        return snapshot
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            self._stop = True
+        self._wakeup_send.send(None)
+        if self._thread is not None:
+            self._thread.join()
+        for worker in self._workers.values():
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._workers.values():
+            if wait:
+                worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+        with self._lock:
+            abandoned = list(self._futures.values())
+            self._futures.clear()
+        for future in abandoned:
+            future.cancel()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -0,0 +1,54 @@
+"""
+Задержка первого запроса к источникам поиска: холодный старт против
+прогрева (DNS-кэш + открытые keep-alive соединения общей сессии).
+
+    python benchmarks/first_request_latency.py
+"""
+import argparse
+import time
+
+import requests
+
+from apex_mind_core.core.dns_cache import dns_cache, install
+from apex_mind_core.core.http_session import prewarm, shared_session
+
+ENDPOINTS = [
+    "https://www.google.com/",
+    "https://ru.wikipedia.org/",
+    "https://en.wikipedia.org/",
+    "https://api.duckduckgo.com/",
+]
+
+
+def _head(session, url: str, timeout: float) -> float:
+    start = time.perf_counter()
+    session.head(url, timeout=timeout, allow_redirects=False).close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':32s} {'cold, ms':>10s} {'warm, ms':>10s}")
+    cold = {}
+    for url in ENDPOINTS:
+        # Новая сессия на запрос — так работал HTTPExecutor до общего пула
+        with requests.Session() as session:
+            cold[url] = _head(session, url, args.timeout)
+
+    install()
+    dns_cache.clear()
+    warmup = prewarm(ENDPOINTS, args.timeout)
+    session = shared_session()
+    for url in ENDPOINTS:
+        if isinstance(warmup.get(url), Exception):
+            print(f"{url:32s} {cold[url] * 1e3:10.1f} {'failed':>10s}")
+            continue
+        warm = _head(session, url, args.timeout)
+        print(f"{url:32s} {cold[url] * 1e3:10.1f} {warm * 1e3:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
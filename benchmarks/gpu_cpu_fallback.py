@@ -0,0 +1,60 @@
+"""
+Бенчмарк CPU-бэкенда GpuCompute против прежнего pass-through.
+
+Pass-through — то, что WASIGuard.execute_op делал без GPU-адаптера
+(возвращал входные данные без вычислений). Для сравнения также приведён
+поэлементный цикл на чистом Python.
+
+    python benchmarks/gpu_cpu_fallback.py --mb 16
+"""
+import argparse
+import array
+import time
+
+from apex_mind_core.core import cpu_compute
+
+
+def _timeit(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=16, help="Размер входного буфера, МБ")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not cpu_compute.available():
+        raise SystemExit("NumPy is not installed: CPU compute backend unavailable")
+
+    count = args.mb * 1024 * 1024 // 4
+    data = array.array("f", range(count % 1000)) * (count // 1000 + 1)
+    data = data[:count].tobytes()
+    kernel = {"name": "mul", "dtype": "float32", "value": 2.0}
+
+    def pure_python():
+        values = array.array("f")
+        values.frombytes(data)
+        return array.array("f", (v * 2.0 for v in values)).tobytes()
+
+    rows = [
+        ("pass-through (no work)", lambda: data),
+        ("cpu backend: mul", lambda: cpu_compute.run_kernel(kernel, data)),
+        ("cpu backend: sum", lambda: cpu_compute.run_kernel({"name": "sum", "dtype": "float32"}, data)),
+        ("cpu backend: sort", lambda: cpu_compute.run_kernel({"name": "sort", "dtype": "float32"}, data)),
+        ("pure python: mul", pure_python),
+    ]
+
+    print(f"buffer={args.mb} MB float32 elements={count}")
+    for label, fn in rows:
+        seconds = _timeit(fn, args.repeat if "pure" not in label else 1)
+        print(f"{label:26s} {seconds * 1e3:10.2f} ms  {args.mb / seconds if seconds else float('inf'):10.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Бенчмарк накладных расходов WASI-контекста на одну операцию.
+
+Сравнивает исходное поведение (create_wasi_context на каждый execute_hardware_op)
+с текущим, где контекст не создаётся: Rust-функция строит Engine/Store
+и сразу их отбрасывает, поэтому вызов был чистыми накладными расходами.
+
+    python benchmarks/wasi_context_overhead.py --ops 2000
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+from apex_mind_core.core.wasi_bridge import ReptilianEngine, HardwareOp, HardwareOpType
+
+try:
+    from wasi_security_layer.wasi_security_layer import create_wasi_context
+except ImportError:
+    from wasi_security_layer import create_wasi_context
+
+
+def _prepare_workspace(root: str, dirs: int) -> str:
+    read_dirs = []
+    for i in range(dirs):
+        d = os.path.join(root, f"data{i}").replace("\\", "/")
+        os.makedirs(d, exist_ok=True)
+        read_dirs.append(d)
+    with open(os.path.join(read_dirs[0], "sample.txt"), "wb") as f:
+        f.write(b"benchmark payload\n")
+
+    os.makedirs(os.path.join(root, "manifests"), exist_ok=True)
+    manifest = {
+        "skill_name": "Benchmark",
+        "filesystem": {"read": read_dirs, "write": [], "delete": []},
+        "network": False,
+        "gpu": False,
+        "sensors": False,
+        "camera": False
+    }
+    with open(os.path.join(root, "manifests", "Benchmark.json"), "w") as f:
+        json.dump(manifest, f)
+    return os.path.join(read_dirs[0], "sample.txt")
+
+
+def _preopens(engine: ReptilianEngine) -> list:
+    # Тот же набор директорий, что исходный WASIGuard.__enter__ передавал в Rust
+    fs = engine._wasi_guard._manifest_dict.get("filesystem", {})
+    return [(p, p) for p in fs.get("read", [])] + [(p, p) for p in fs.get("write", [])]
+
+
+def _run(engine: ReptilianEngine, path: str, ops: int, rebuild: bool) -> float:
+    preopens = _preopens(engine)
+    op = HardwareOp(HardwareOpType.FileRead)
+    op.path = path
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        if rebuild:
+            # Исходное поведение: новый Engine/Store на каждую операцию
+            create_wasi_context(preopens)
+        engine.execute_hardware_op(op)
+    return (time.perf_counter() - start) / ops
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=1000)
+    parser.add_argument("--dirs", type=int, default=4, help="Количество preopen-директорий")
+    args = parser.parse_args()
+    # Логирование каждой операции исказит замеры
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as root:
+        path = _prepare_workspace(root, args.dirs)
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            engine = ReptilianEngine("Benchmark")
+            before = _run(engine, path, args.ops, rebuild=True)
+            after = _run(engine, path, args.ops, rebuild=False)
+        finally:
+            os.chdir(cwd)
+
+    print(f"ops={args.ops} preopen_dirs={args.dirs}")
+    print(f"per-op, context per op  : {before * 1e6:10.1f} us")
+    print(f"per-op, no context call : {after * 1e6:10.1f} us")
+    print(f"speedup                 : {before / after if after else float('inf'):10.2f}x")
+
+
+if __name__ == "__main__":
+    main()